@@ -1,13 +1,21 @@
 # file: src/bot/database/models.py
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, create_engine
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, create_engine, func, select
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import column_property, relationship, sessionmaker
 from ..config.settings import DATABASE_PATH
 
 Base = declarative_base()
 
+class JobPhoto(Base):
+    __tablename__ = 'job_photos'
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey('grounds_data.id'))
+    path = Column(String)
+    uploaded_date = Column(String)
+
 class Ground(Base):
     __tablename__ = 'grounds_data'
 
@@ -25,11 +33,15 @@ class Ground(Base):
     map_link = Column(String)
     assigned_to = Column(Integer)
     status = Column(String, default='pending')
-    photos = Column(String)
     start_time = Column(DateTime)
     finish_time = Column(DateTime)
     notes = Column(String)
     scheduled_date = Column(String)
+    # Photos live in job_photos; the legacy pipe-joined grounds_data.photos column is no longer read
+    photo_records = relationship(JobPhoto, order_by=JobPhoto.id)
+    photo_count = column_property(
+        select(func.count(JobPhoto.id)).where(JobPhoto.job_id == id).correlate_except(JobPhoto).scalar_subquery()
+    )
 
     def to_dict(self) -> dict:
         """Convert the model to a dictionary."""
@@ -48,18 +60,13 @@ class Ground(Base):
             'map_link': self.map_link,
             'assigned_to': self.assigned_to,
             'status': self.status,
-            'photos': self.photos.split('|') if self.photos else [],
+            'photos': [photo.path for photo in self.photo_records],
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'finish_time': self.finish_time.isoformat() if self.finish_time else None,
             'notes': self.notes,
             'scheduled_date': self.scheduled_date
         }
 
-    @property
-    def photo_count(self) -> int:
-        """Get the number of photos for this ground."""
-        return len(self.photos.split('|')) if self.photos else 0
-
     @property
     def duration(self) -> Optional[str]:
         """Calculate the duration of the job."""
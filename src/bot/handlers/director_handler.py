@@ -193,7 +193,7 @@ class DirectorHandler(BaseHandler):
     @director_only
     async def view_job_details(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """View detailed job information with enhanced UI."""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         db = await self._get_db()
         ground = await self.ground_service.get_ground(db, job_id)
         
@@ -231,7 +231,7 @@ class DirectorHandler(BaseHandler):
         markup = ButtonLayouts.create_job_menu(
             job_id=job_id,
             status=ground.status,
-            has_photos=bool(ground.photos),
+            has_photos=ground.photo_count > 0,
             has_notes=bool(ground.notes)
         )
 
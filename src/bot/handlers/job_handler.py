@@ -49,7 +49,7 @@ class JobHandler(BaseHandler):
         markup = ButtonLayouts.create_job_menu(
             job_id=job_id,
             status=ground.status,
-            has_photos=bool(ground.photos),
+            has_photos=ground.photo_count > 0,
             has_notes=bool(ground.notes)
         )
 
@@ -59,7 +59,7 @@ class JobHandler(BaseHandler):
     @employee_required
     async def start_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start a job with note-taking capability"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         db = await self._get_db()
         
         # Start the job
@@ -84,7 +84,7 @@ class JobHandler(BaseHandler):
     @employee_required
     async def add_note_to_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Prepare to receive a note for the current job"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         context.user_data["awaiting_note_for"] = job_id
         
         await self._send_message(
@@ -124,7 +124,7 @@ class JobHandler(BaseHandler):
     @employee_required
     async def finish_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Complete a job with enhanced UI feedback."""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         db = await self._get_db()
         
         success, message = await self.ground_service.finish_job(db, job_id)
@@ -262,7 +262,7 @@ class JobHandler(BaseHandler):
 
     async def add_note(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start note addition process"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         context.user_data["awaiting_note_for"] = job_id
         await self._send_message(update, "Please enter your note for this job:")
     async def handle_text(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -342,7 +342,7 @@ class JobHandler(BaseHandler):
         
     async def prepare_add_note(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Prepare context for note addition"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         context.user_data["awaiting_note_for"] = job_id
         context.user_data["note_type"] = "text"
         
@@ -356,7 +356,7 @@ class JobHandler(BaseHandler):
     
     async def prepare_add_photo_note(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Prepare context for photo note addition"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         context.user_data["awaiting_note_for"] = job_id
         context.user_data["note_type"] = "photo"
         
@@ -406,7 +406,7 @@ class JobHandler(BaseHandler):
         )
     async def start_job_with_notes(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start a job and prepare for note-taking"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         db = await self._get_db()
         
         # Start the job
@@ -436,7 +436,7 @@ class JobHandler(BaseHandler):
         )
     async def add_work_note(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Prepare to receive a work note"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         context.user_data["awaiting_work_note"] = job_id
         
         await self._send_message(
@@ -477,7 +477,7 @@ class JobHandler(BaseHandler):
         )
     async def job_working_view(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show the job working interface with notes"""
-        job_id = int(self.get_callback_data(update).split('_')[-1])
+        job_id = int(self.get_callback_data(update).rpartition('_')[2])
         db = await self._get_db()
         ground = await self.ground_service.get_ground(db, job_id)
         notes = NoteService.get_notes_for_job(db, job_id)
@@ -4,7 +4,7 @@ from pathlib import Path
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
-from ..database.models import Ground
+from ..database.models import Ground, JobPhoto
 from ..config.settings import PHOTOS_DIR, MAX_PHOTOS_PER_JOB
 
 class GroundService:
@@ -60,15 +60,14 @@ class GroundService:
         if not ground:
             return False, "Ground not found", 0
 
-        current_photos = ground.photos.split('|') if ground.photos else []
-        if len(current_photos) >= MAX_PHOTOS_PER_JOB:
-            return False, f"Maximum number of photos ({MAX_PHOTOS_PER_JOB}) reached", len(current_photos)
+        photo_count = db.query(JobPhoto).filter(JobPhoto.job_id == ground_id).count()
+        if photo_count >= MAX_PHOTOS_PER_JOB:
+            return False, f"Maximum number of photos ({MAX_PHOTOS_PER_JOB}) reached", photo_count
 
-        new_photos = ground.photos.strip() + '|' + photo_path if ground.photos else photo_path
-        ground.photos = new_photos
+        db.add(JobPhoto(job_id=ground_id, path=photo_path, uploaded_date=datetime.now().date().isoformat()))
         db.commit()
         
-        return True, "Photo added successfully", len(new_photos.split('|'))
+        return True, "Photo added successfully", photo_count + 1
 
     @staticmethod
     async def update_note(db: Session, ground_id: int, note: str) -> Tuple[bool, str]:
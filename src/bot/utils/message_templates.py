@@ -3,6 +3,7 @@ from asyncio.log import logger
 import logging
 from typing import Optional, List, Dict
 from datetime import datetime
+from functools import lru_cache
 
 from telegram import Update
 
@@ -68,9 +69,14 @@ class MessageTemplates:
     @staticmethod
     def format_dashboard_header(name: str, role: str) -> str:
         """Format an enhanced dashboard header."""
-        greeting = MessageTemplates.get_greeting()
-        current_time = datetime.now().strftime("%I:%M %p")
-        
+        # Greeting and clock change by the minute, so they are part of the cache key
+        return MessageTemplates._dashboard_header(
+            name, role, MessageTemplates.get_greeting(), datetime.now().strftime("%I:%M %p")
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _dashboard_header(name: str, role: str, greeting: str, current_time: str) -> str:
         header = [
             f"{greeting}, {name}!",
             f"🕒 Current Time: {current_time}",
@@ -95,6 +101,7 @@ class MessageTemplates:
         )
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def format_job_list_header(date: Optional[str] = None, count: Optional[int] = None) -> str:
         """Format an enhanced job list header."""
         date_str = f" for {date}" if date else ""
@@ -106,13 +113,15 @@ class MessageTemplates:
         )
 
     @staticmethod
-    def format_error_message(error: str, details: Optional[str] = None) -> str:
+    @lru_cache(maxsize=256)
+    def format_error_message(error: str, details: Optional[str] = None, code: Optional[str] = None) -> str:
         """Format an enhanced error message."""
         details_section = f"\n{details}" if details else ""
+        code_section = f"\nCode: {code}" if code else ""
         return (
             f"⚠️ Error Occurred\n"
             f"{MessageTemplates.SEPARATOR}\n"
-            f"{error}{details_section}"
+            f"{error}{details_section}{code_section}"
         )
 
     @staticmethod
@@ -1,8 +1,16 @@
 # file: /src/bot/utils/user_role.py
+from functools import lru_cache
+
 from ..config.settings import dev_users, director_users, employee_users
 
+@lru_cache(maxsize=1024)
 def get_user_role(user_id: int) -> str:
-    """Get the role of a user based on their ID."""
+    """Get the role of a user based on their ID.
+
+    Cached, since the role sets are loaded from settings.py at import and
+    only change on restart. Code that mutates them in place must call
+    invalidate_role_cache() afterwards.
+    """
     if user_id in dev_users:
         return "Dev"
     elif user_id in director_users:
@@ -10,6 +18,11 @@ def get_user_role(user_id: int) -> str:
     elif user_id in employee_users:
         return "Employee"
     return "Generic"
+
+def invalidate_role_cache():
+    """Forget cached roles after the user sets are edited"""
+    get_user_role.cache_clear()
+
 def get_employee_name(user_id: int) -> str:
     """Get employee name by ID"""
     return employee_users.get(user_id, "Employee")
\ No newline at end of file
@@ -20,14 +20,20 @@
 ######################################################
 
 import os
+import re
 import logging
 import sqlite3
+import aiosqlite
 from datetime import datetime, timedelta
 import asyncio
 from PIL import Image
-import io
 import time as time_module  # Renamed to avoid conflict with datetime.time
 import threading
+import signal
+import queue
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 from telegram import (
 Update,
@@ -37,6 +43,7 @@ InputMediaPhoto
 )
 from telegram.ext import (
 ApplicationBuilder,
+AIORateLimiter,
 CommandHandler,
 CallbackQueryHandler,
 CallbackContext,
@@ -46,8 +53,8 @@ filters
 from telegram.error import BadRequest
 
 # Custom modules – ensure these are working correctly.
-from weather_integration import get_weather_forecast, format_weather_message
-from src.bot.utils.user_role import get_user_role
+from weather_integration import WEATHER_API_KEY, get_weather_forecast, format_weather_message
+from src.bot.utils.user_role import get_user_role, invalidate_role_cache
 from src.bot.handlers.job_handler import JobHandler
 from src.bot.utils.message_templates import MessageTemplates
 from src.bot.utils.button_layouts import ButtonLayouts
@@ -73,13 +80,13 @@ logger = logging.getLogger(__name__)
 # Log employee users for debugging
 logger.info(f"Employee users: {employee_users}")
 
+# Employee ids by lowercase name; keep in step with employee_users
+_employees_by_name = {name.lower(): emp_id for emp_id, name in employee_users.items()}
+
 # Make sure Alex's ID is correct
-alex_id = None
-for emp_id, name in employee_users.items():
-    if name.lower() == "alex":
-        alex_id = emp_id
-        logger.info(f"Found Alex's ID in employee_users: {alex_id}")
-        break
+alex_id = _employees_by_name.get("alex")
+if alex_id:
+    logger.info(f"Found Alex's ID in employee_users: {alex_id}")
 
 if not alex_id:
     # If Alex's ID is not in employee_users, add it
@@ -88,59 +95,343 @@ if not alex_id:
     # Try to update employee_users if possible
     try:
         employee_users[alex_id] = "Alex"
+        _employees_by_name["alex"] = alex_id
         logger.info(f"Added Alex's ID to employee_users: {alex_id}")
     except Exception as e:
         logger.error(f"Could not update employee_users: {e}")
 
 user_data = {}
 
-async def safe_edit_text(update: Update, text: str, reply_markup: InlineKeyboardMarkup = None):
+# (chat_id, message_id) of messages with an edit in flight, and the newest edit queued behind it
+_edits_in_flight = set()
+_pending_edits = {}
+
+async def _send_edit(message, text: str, reply_markup: InlineKeyboardMarkup = None):
     try:
-        await update.effective_message.edit_text(text, reply_markup=reply_markup)
+        await message.edit_text(text, reply_markup=reply_markup)
     except Exception as e:
         logger.error(f"Error editing message: {e}")
-        await update.effective_message.reply_text(text, reply_markup=reply_markup)
+        await message.reply_text(text, reply_markup=reply_markup)
+
+async def safe_edit_text(update: Update, text: str, reply_markup: InlineKeyboardMarkup = None):
+    """Edit the message in place. Sent at once when the message is idle; edits arriving while one
+    is in flight collapse into a single trailing edit with the newest state."""
+    message = update.effective_message
+    key = (message.chat_id, message.message_id)
+    if key in _edits_in_flight:
+        # The in-flight caller sends this (or anything newer) when its own edit finishes
+        _pending_edits[key] = (text, reply_markup)
+        return
+    _edits_in_flight.add(key)
+    try:
+        while True:
+            await _send_edit(message, text, reply_markup)
+            pending = _pending_edits.pop(key, None)
+            if pending is None:
+                break
+            text, reply_markup = pending
+    finally:
+        # Always release the key, or a cancelled caller would block every later edit
+        _edits_in_flight.discard(key)
+        _pending_edits.pop(key, None)
+
+# Callback queries callback_handler has already answered (Telegram rejects a second answer)
+_answered_queries = set()
+_answer_tasks = set()
+
+def _answer_done(task):
+    _answer_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Error answering callback query: {task.exception()}")
+
+def answer_callback_early(update: Update):
+    """Answer the callback query in the background so the round trip overlaps the handler's work."""
+    query = update.callback_query
+    _answered_queries.add(query.id)
+    task = asyncio.create_task(query.answer())
+    _answer_tasks.add(task)
+    task.add_done_callback(_answer_done)
+
+async def answer_callback(update: Update, text: str = None, show_alert: bool = False):
+    """Answer the callback query with text; once it has been answered, alerts are shown by editing the message."""
+    query = update.callback_query
+    if query.id in _answered_queries:
+        if show_alert:
+            # Keep the message's keyboard so the user isn't left without controls
+            await safe_edit_text(update, f"⚠️ {text}", reply_markup=query.message.reply_markup)
+        else:
+            logger.debug(f"Callback query already answered, dropping: {text}")
+        return
+    _answered_queries.add(query.id)
+    await query.answer(text, show_alert=show_alert)
 
 #####################
 # SITE INFO UPDATES
 #####################
 
+SITE_INFO_UPDATES = {
+    "Avonmouth wind farm": {"contact": "Operational control - 03452008173"},
+    "Orchard medical centre": {"contact": "Ollie - 07542826816", "gate_code": "2489Z"},
+    "Vauxhall Weston super mare": {"contact": "Simon - 07403320588"},
+    "Hannah more primary school": {"contact": "Bob - 07766065032"},
+    "Bristol card solutions": {"contact": "Dan - 07545053817"},
+    "Greenfield Gospel": {"gate_code": "1510"},
+    "Magpie cottage": {"gate_code": "1275"},
+    "Vauxhall Bristol": {"contact": "Mike - 07865936855"},
+    "Ipeco composites": {"contact": "Graeme - 07880006105"},
+    "Patchway Camera studios": {"gate_code": "08710"},
+    "Rowling gate 1": {"gate_code": "C1720"},
+    "Wessex water": {"gate_code": "5969"},
+    "Mercedes Bristol": {"gate_code": "0832"},
+    "Cabot Barton man": {"gate_code": "7489"},
+    "Trinity lodge": {"gate_code": "3841"},
+    "BioTechne": {"contact": "James - 07970743364"}
+}
+
 def update_site_info(site_name, contact, gate_code):
-    SITE_INFO_UPDATES = {
-         "Avonmouth wind farm": {"contact": "Operational control - 03452008173"},
-         "Orchard medical centre": {"contact": "Ollie - 07542826816", "gate_code": "2489Z"},
-         "Vauxhall Weston super mare": {"contact": "Simon - 07403320588"},
-         "Hannah more primary school": {"contact": "Bob - 07766065032"},
-         "Bristol card solutions": {"contact": "Dan - 07545053817"},
-         "Greenfield Gospel": {"gate_code": "1510"},
-         "Magpie cottage": {"gate_code": "1275"},
-         "Vauxhall Bristol": {"contact": "Mike - 07865936855"},
-         "Ipeco composites": {"contact": "Graeme - 07880006105"},
-         "Patchway Camera studios": {"gate_code": "08710"},
-         "Rowling gate 1": {"gate_code": "C1720"},
-         "Wessex water": {"gate_code": "5969"},
-         "Mercedes Bristol": {"gate_code": "0832"},
-         "Cabot Barton man": {"gate_code": "7489"},
-         "Trinity lodge": {"gate_code": "3841"},
-         "BioTechne": {"contact": "James - 07970743364"}
-    }
-    if site_name in SITE_INFO_UPDATES:
-        info = SITE_INFO_UPDATES[site_name]
-        if "contact" in info:
-            contact = info["contact"]
-        if "gate_code" in info:
-            gate_code = info["gate_code"]
+    override = SITE_INFO_UPDATES.get(site_name)
+    if override:
+        contact = override.get("contact", contact)
+        gate_code = override.get("gate_code", gate_code)
     return contact, gate_code
 
+# Area keywords that mark a job as outdoor (weather forecast + refresh button)
+OUTDOOR_RE = re.compile(r"garden|outdoor|yard|field|grounds|exterior", re.IGNORECASE)
+
 #####################
 # DATABASE SETUP
 #####################
 
-conn = sqlite3.connect("bot_data.db", check_same_thread=False)
-cursor = conn.cursor()
+DB_PATH = "bot_data.db"
+READ_POOL_SIZE = 4
+# Compiled statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+# Per-connection tuning applied to the writer and every read connection
+TUNING_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+class DBWriter:
+    """Owns the only writable connection; commits queued writes in batches on one thread."""
 
-cursor.executescript(
+    def __init__(self, path: str, max_batch: int = 64, timeout: float = 0.005):
+        self._path = path
+        self._max_batch = max_batch
+        self._timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, item):
+        """Queue a (sql, params, future, loop) tuple for the writer thread.
+
+        sql may instead be a list of (sql, params) pairs, which then succeed or fail together.
+        """
+        self._queue.put(item)
+
+    async def execute(self, sql: str, params=()) -> int:
+        """Run a write statement on the writer thread and return its rowcount."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.submit((sql, params, future, loop))
+        return await future
+
+    async def execute_atomic(self, statements: list) -> int:
+        """Run several (sql, params) writes in one savepoint; all or none are applied. Returns the total rowcount."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.submit((list(statements), None, future, loop))
+        return await future
+
+    def _drain(self) -> list:
+        batch = [self._queue.get()]
+        while batch[-1] is not None and len(batch) < self._max_batch:
+            try:
+                batch.append(self._queue.get(timeout=self._timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    @staticmethod
+    def _resolve(future, rowcount, error):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(rowcount)
+
+    def _run(self):
+        conn = sqlite3.connect(self._path, isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for pragma in TUNING_PRAGMAS:
+            conn.execute(pragma)
+        running = True
+        while running:
+            batch = self._drain()
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+            if not batch:
+                continue
+            results = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for sql, params, future, loop in batch:
+                    # A savepoint per statement keeps one bad write from failing the whole batch
+                    conn.execute("SAVEPOINT write")
+                    try:
+                        if isinstance(sql, list):
+                            rowcount = sum(conn.execute(stmt, stmt_params).rowcount for stmt, stmt_params in sql)
+                        else:
+                            rowcount = conn.execute(sql, params).rowcount
+                        conn.execute("RELEASE write")
+                        results.append((future, loop, rowcount, None))
+                    except Exception as e:
+                        # Not just sqlite3.Error: e.g. an int param too large raises OverflowError
+                        conn.execute("ROLLBACK TO write")
+                        conn.execute("RELEASE write")
+                        results.append((future, loop, None, e))
+                conn.execute("COMMIT")
+            except Exception as e:
+                # Whatever happens the thread keeps running and every caller in the batch gets an answer
+                logger.error(f"Database writer batch failed: {e}")
+                try:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                except sqlite3.Error as rollback_error:
+                    logger.error(f"Database writer rollback failed: {rollback_error}")
+                results = [(future, loop, None, e) for _, _, future, loop in batch]
+            for future, loop, rowcount, error in results:
+                try:
+                    loop.call_soon_threadsafe(self._resolve, future, rowcount, error)
+                except RuntimeError:
+                    # The caller's loop has already closed; nobody is waiting on this future
+                    pass
+        conn.close()
+
+db_writer = DBWriter(DB_PATH)
+_read_pool = None
+
+@asynccontextmanager
+async def read_conn():
+    """Borrow one of the read-only connections for the duration of the block."""
+    conn = await _read_pool.get()
+    try:
+        yield conn
+    finally:
+        _read_pool.put_nowait(conn)
+
+async def db_fetchone(sql: str, params=()):
+    async with read_conn() as conn:
+        async with conn.execute(sql, params) as cur:
+            return await cur.fetchone()
+
+async def db_fetchall(sql: str, params=()):
+    async with read_conn() as conn:
+        async with conn.execute(sql, params) as cur:
+            return await cur.fetchall()
+
+async def db_execute(sql: str, params=()) -> int:
+    return await db_writer.execute(sql, params)
+
+async def db_execute_atomic(statements: list) -> int:
+    return await db_writer.execute_atomic(statements)
+
+# Hot statements shared by the handlers so each connection prepares them once
+SQL_JOB_STATUS = "SELECT status FROM grounds_data WHERE id = ?"
+SQL_JOB_SITE_NAME = "SELECT site_name FROM grounds_data WHERE id = ?"
+SQL_JOB_SITE_FINISH = "SELECT site_name, finish_time FROM grounds_data WHERE id = ?"
+SQL_START_JOB = "UPDATE grounds_data SET status = 'in_progress', start_time = ? WHERE id = ?"
+SQL_FINISH_JOB = "UPDATE grounds_data SET status = 'completed', finish_time = ? WHERE id = ?"
+# Ids per UPDATE ... IN (...) statement, well under SQLite's bound-parameter limit
+ASSIGN_CHUNK_SIZE = 500
+SQL_JOB_PHOTOS = "SELECT path FROM job_photos WHERE job_id = ? AND uploaded_date = ? ORDER BY id"
+SQL_COUNT_JOB_PHOTOS = "SELECT COUNT(*) FROM job_photos WHERE job_id = ? AND uploaded_date = ?"
+SQL_JOB_DETAILS = (
+    "SELECT site_name, start_time, finish_time, notes, contact, gate_code, map_link, area, address, status "
+    "FROM grounds_data WHERE id = ?"
+)
+SQL_JOB_LOCATION = "SELECT site_name, area, address FROM grounds_data WHERE id = ?"
+
+# Single-job lookups shared by the navigation callbacks: {job_id: {sql: (expires, row)}}
+JOB_CACHE_TTL = 60
+JOB_CACHE_MAX = 512
+_job_cache = {}
+
+async def get_job(job_id: int, sql: str):
+    """db_fetchone(sql, (job_id,)) memoized for JOB_CACHE_TTL seconds; writers call invalidate_job."""
+    now = time_module.monotonic()
+    hit = _job_cache.get(job_id, {}).get(sql)
+    if hit and hit[0] > now:
+        return hit[1]
+    row = await db_fetchone(sql, (job_id,))
+    if job_id not in _job_cache and len(_job_cache) >= JOB_CACHE_MAX:
+        _job_cache.clear()
+    _job_cache.setdefault(job_id, {})[sql] = (now + JOB_CACHE_TTL, row)
+    return row
+
+def invalidate_job(job_id=None):
+    """Drop cached lookups for one job, or for every job when job_id is None"""
+    if job_id is None:
+        _job_cache.clear()
+    else:
+        _job_cache.pop(job_id, None)
+
+# Jobs per status for the director dashboard, kept current by the status-change handlers
+STATUS_COUNTS_RECONCILE_SECONDS = 60
+_status_counts = {}
+
+async def refresh_status_counts(context: CallbackContext = None):
+    """Reload _status_counts from the table (startup, daily reset and the periodic reconcile job)"""
+    counts = dict(await db_fetchall("SELECT status, COUNT(*) FROM grounds_data GROUP BY status"))
+    _status_counts.clear()
+    _status_counts.update(counts)
+
+def move_status_count(old_status, new_status):
+    _status_counts[old_status] = max(0, _status_counts.get(old_status, 0) - 1)
+    _status_counts[new_status] = _status_counts.get(new_status, 0) + 1
+
+async def init_db(application):
+    """Create tables, indexes and late-added columns, then start the writer and read pool (run from post_init)."""
+    global _read_pool
+    async with aiosqlite.connect(DB_PATH, isolation_level=None) as conn:
+        await conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
+        await _create_schema(conn)
+    db_writer.start()
+    _read_pool = asyncio.Queue()
+    for _ in range(READ_POOL_SIZE):
+        _read_pool.put_nowait(await _open_read_conn())
+    await refresh_status_counts()
+
+async def _open_read_conn():
+    conn = await aiosqlite.connect(f"file:{DB_PATH}?mode=ro", uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+    for pragma in TUNING_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+# Columns added after the first release, created on older databases at startup
+LATE_COLUMNS = {
+    "scheduled_date": "TEXT",
+    "priority": "TEXT DEFAULT 'normal'",
+}
+
+async def _create_schema(conn):
+    await conn.executescript(
 """
+BEGIN IMMEDIATE;
 CREATE TABLE IF NOT EXISTS grounds_data (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     site_name TEXT UNIQUE,
@@ -172,125 +463,313 @@ note TEXT,
 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 FOREIGN KEY(job_id) REFERENCES grounds_data(id)
 );
-"""
-)
-cursor.executescript(""" 
+CREATE TABLE IF NOT EXISTS job_photos (
+id INTEGER PRIMARY KEY,
+job_id INTEGER,
+path TEXT,
+uploaded_date TEXT,
+FOREIGN KEY(job_id) REFERENCES grounds_data(id)
+);
 CREATE INDEX IF NOT EXISTS idx_grounds_assigned_to ON grounds_data(assigned_to);
 CREATE INDEX IF NOT EXISTS idx_grounds_status ON grounds_data(status);
 CREATE INDEX IF NOT EXISTS idx_grounds_site_name ON grounds_data(site_name);
-""")
-try:
-    cursor.execute("ALTER TABLE grounds_data ADD COLUMN scheduled_date TEXT;")
-    cursor.execute("ALTER TABLE grounds_data ADD COLUMN priority TEXT DEFAULT 'normal';")
-    conn.commit()
-    logger.info("Database setup complete.")
-except sqlite3.OperationalError:
-    logger.info("Database setup: New columns likely already exist.")
-
-# Helper function to filter photos by date
-def filter_photos_by_date(photos_str, target_date):
-    """Filter photos based on date in filename"""
-    if not photos_str or not photos_str.strip():
-        return []
-    
-    photo_paths = photos_str.strip().split("|")
-    filtered_paths = []
-    
-    for path in photo_paths:
-        # Check if the photo filename contains the target date
-        if target_date in path:
-            filtered_paths.append(path)
-    
-    return filtered_paths
+CREATE INDEX IF NOT EXISTS idx_grounds_emp_dashboard ON grounds_data(assigned_to, status, id) WHERE status != 'completed';
+CREATE INDEX IF NOT EXISTS idx_grounds_unassigned ON grounds_data(id) WHERE assigned_to IS NULL;
+CREATE INDEX IF NOT EXISTS idx_grounds_assigned_status_finish ON grounds_data(assigned_to, status, finish_time DESC);
+CREATE INDEX IF NOT EXISTS idx_job_photos_job_date ON job_photos(job_id, uploaded_date);
+COMMIT;
+"""
+    )
+    # Check the live columns under the write lock so concurrent restarts can't both add one
+    await conn.execute("BEGIN IMMEDIATE")
+    existing = {row[1] for row in await conn.execute_fetchall("PRAGMA table_info(grounds_data)")}
+    missing = [name for name in LATE_COLUMNS if name not in existing]
+    for name in missing:
+        await conn.execute(f"ALTER TABLE grounds_data ADD COLUMN {name} {LATE_COLUMNS[name]}")
+    await conn.execute("COMMIT")
+    logger.info(f"Database setup complete. Added columns: {', '.join(missing) or 'none'}")
+    await _backfill_job_photos(conn)
+    # Refresh planner statistics so the partial indexes get picked up
+    await conn.execute("ANALYZE")
+
+# Upload date embedded in photo filenames: job_{id}_{YYYY-MM-DD}_{file_id}.jpg
+PHOTO_DATE_RE = re.compile(r"_(\d{4}-\d{2}-\d{2})_")
+
+async def _backfill_job_photos(conn):
+    """Copy the legacy pipe-separated grounds_data.photos paths into job_photos (once)."""
+    async with conn.execute("SELECT 1 FROM job_photos LIMIT 1") as cur:
+        if await cur.fetchone():
+            return
+    rows = await conn.execute_fetchall("SELECT id, photos FROM grounds_data WHERE photos IS NOT NULL AND photos != ''")
+    photos = []
+    for job_id, photos_str in rows:
+        for path in photos_str.strip().split("|"):
+            path = path.strip()
+            if path:
+                match = PHOTO_DATE_RE.search(path)
+                photos.append((job_id, path, match.group(1) if match else None))
+    if photos:
+        await conn.execute("BEGIN")
+        await conn.executemany("INSERT INTO job_photos (job_id, path, uploaded_date) VALUES (?, ?, ?)", photos)
+        await conn.execute("COMMIT")
+        logger.info(f"Copied {len(photos)} legacy photo paths into job_photos")
+
+async def close_db(application):
+    """Stop the writer thread, close the read pool and release the photo I/O threads on shutdown."""
+    global _read_pool
+    await asyncio.get_running_loop().run_in_executor(None, db_writer.stop)
+    _io_pool.shutdown(wait=False, cancel_futures=True)
+    if _read_pool is not None:
+        while not _read_pool.empty():
+            await _read_pool.get_nowait().close()
+        _read_pool = None
+
+MAX_PHOTOS_PER_DAY = 25
+PHOTO_DIR = "photos"
+# Stored photo paths are relative to the directory the bot was started from
+PHOTO_ROOT = os.getcwd()
+
+# Helper function to list a job's photos for a specific date
+async def get_job_photos(job_id, target_date):
+    """Photo paths uploaded for a job on the given date, in upload order"""
+    rows = await db_fetchall(SQL_JOB_PHOTOS, (job_id, target_date))
+    return [row[0] for row in rows]
 
 # Helper function to count photos for a specific date
-def count_photos_for_date(photos_str, target_date):
-    """Count photos for a specific date"""
-    return len(filter_photos_by_date(photos_str, target_date))
+async def count_job_photos(job_id, target_date):
+    """Count photos uploaded for a job on the given date"""
+    row = await db_fetchone(SQL_COUNT_JOB_PHOTOS, (job_id, target_date))
+    return row[0]
 
 #####################################
 # HELPER FUNCTIONS (Defined early)
 #####################################
 
-async def format_job_section(section_title: str, jobs: list) -> list:
-    # This function now handles tuples with 7 or 8 fields.
-    if len(jobs[0]) == 8:
-        status_val = jobs[0][5]
-    else:
-        status_val = jobs[0][3]
-    sections = [f"\n{MessageTemplates.STATUS_EMOJIS.get(status_val.lower(), '❓')} {section_title} Jobs:"]
-    for job in jobs:
-        if len(job) == 8:
-            job_id, site_name, scheduled_date, start_time, finish_time, status, area, notes = job
-        elif len(job) == 7:
-            job_id, site_name, area, status, notes, start_time, finish_time = job
+_today_cache = ("", 0.0)
+
+def today_iso() -> str:
+    """Today's date as YYYY-MM-DD, only recomputed once the day rolls over"""
+    global _today_cache
+    today, expires = _today_cache
+    if time_module.time() >= expires:
+        current = datetime.now().date()
+        today = current.isoformat()
+        _today_cache = (today, datetime.combine(current + timedelta(days=1), datetime.min.time()).timestamp())
+    return today
+
+# Telegram file_ids of photos we have already uploaded: {abs_path: (mtime, file_id)}
+photo_file_id_cache = {}
+
+# All photo file work (outgoing reads, upload verification, deletes), kept off the event loop
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="photo-io")
+
+def _read_photo_media(abs_path):
+    mtime = os.stat(abs_path).st_mtime
+    cached = photo_file_id_cache.get(abs_path)
+    if cached and cached[0] == mtime:
+        return cached[1], mtime
+    with open(abs_path, 'rb') as f:
+        return f.read(), mtime
+
+def _read_photo_batch(abs_paths):
+    results = []
+    for abs_path in abs_paths:
+        try:
+            results.append(_read_photo_media(abs_path))
+        except Exception as e:
+            results.append(e)
+    return results
+
+async def photo_media(abs_path):
+    """Cached file_id for a photo (or its bytes to upload when it is new or changed), plus its mtime"""
+    return await asyncio.get_running_loop().run_in_executor(_io_pool, _read_photo_media, abs_path)
+
+async def photo_media_batch(abs_paths):
+    """photo_media for a whole page in one executor job; a failed path gets its exception in place of the tuple"""
+    return await asyncio.get_running_loop().run_in_executor(_io_pool, _read_photo_batch, abs_paths)
+
+def remember_file_ids(sent, messages):
+    """Cache the file_id Telegram assigned to each sent photo; sent is [(abs_path, mtime)]"""
+    for (abs_path, mtime), message in zip(sent, messages):
+        if message and message.photo:
+            photo_file_id_cache[abs_path] = (mtime, message.photo[-1].file_id)
+
+# Telegram accepts at most 10 items per media group
+MEDIA_GROUP_SIZE = 10
+
+# AIORateLimiter only limits group chats per chat, so bursts to one private chat are spaced here:
+# {chat_id: monotonic time the next send may start}
+CHAT_SEND_INTERVAL = 1.0
+_chat_next_send = {}
+
+async def pace_chat(chat_id: int):
+    """Wait until chat_id may receive its next message (1/s per chat); the slot is reserved first."""
+    now = time_module.monotonic()
+    start = max(now, _chat_next_send.get(chat_id, 0))
+    _chat_next_send[chat_id] = start + CHAT_SEND_INTERVAL
+    if start > now:
+        await asyncio.sleep(start - now)
+
+async def _send_media_pages(message, media_group, sent, caption, markup, single_caption=None):
+    """Reply with photos in media groups of up to 10, then the caption and keyboard.
+
+    A lone photo carries the caption (or single_caption) and keyboard itself. sent holds the
+    (abs_path, mtime) pairs matching media_group so the returned file_ids can be cached.
+    """
+    if len(media_group) == 1:
+        await pace_chat(message.chat_id)
+        reply = await message.reply_photo(photo=media_group[0].media, caption=single_caption or caption, reply_markup=markup)
+        remember_file_ids(sent, [reply])
+        return
+    for i in range(0, len(media_group), MEDIA_GROUP_SIZE):
+        chunk = media_group[i:i + MEDIA_GROUP_SIZE]
+        await pace_chat(message.chat_id)
+        if len(chunk) == 1:
+            replies = [await message.reply_photo(photo=chunk[0].media, caption=chunk[0].caption)]
         else:
-            continue
-        duration = "N/A"
-        if start_time and finish_time:
-            try:
-                duration = str(datetime.fromisoformat(finish_time) - datetime.fromisoformat(start_time)).split('.')[0]
-            except Exception:
-                duration = "N/A"
+            replies = await message.reply_media_group(media=chunk)
+        remember_file_ids(sent[i:i + MEDIA_GROUP_SIZE], replies)
+    await pace_chat(message.chat_id)
+    await message.reply_text(caption, reply_markup=markup)
+
+def verify_photo(photo_path) -> float:
+    """Return the saved file's mtime, or raise if it is not a valid image, deleting it first
+    (blocking; run in an executor)"""
+    try:
+        with Image.open(photo_path) as img:
+            img.verify()
+    except Exception:
+        os.remove(photo_path)
+        raise
+    return os.stat(photo_path).st_mtime
+
+# Job rows for the section/button helpers; duration_s is worked out by SQLite on whole seconds
+# (fractions cut off each timestamp) so it always agrees with parse_times
+JOB_SECTION_COLUMNS = (
+    "id, site_name, area, status, notes, "
+    "strftime('%s', substr(finish_time, 1, 19)) - strftime('%s', substr(start_time, 1, 19)) AS duration_s"
+)
+
+def format_duration(seconds) -> str:
+    """H:MM:SS for a duration in seconds"""
+    return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+def _parse_iso(value):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        logger.error(f"Unparseable timestamp: {value!r}")
+        return None
+
+def parse_times(start_time, finish_time) -> tuple:
+    """(start_dt, finish_dt, photo_date, duration) for a job's stored timestamps.
+
+    photo_date is the finish date, or today while the job is unfinished; duration is H:MM:SS or None.
+    """
+    start_dt = _parse_iso(start_time)
+    finish_dt = _parse_iso(finish_time)
+    photo_date = finish_dt.date().isoformat() if finish_dt else today_iso()
+    duration = None
+    if start_dt and finish_dt:
+        # Whole seconds of each timestamp, matching duration_s in JOB_SECTION_COLUMNS
+        duration = format_duration(int((finish_dt.replace(microsecond=0) - start_dt.replace(microsecond=0)).total_seconds()))
+    return start_dt, finish_dt, photo_date, duration
+
+async def format_job_section(section_title: str, jobs: list) -> list:
+    # Rows are selected with JOB_SECTION_COLUMNS
+    sections = [f"\n{MessageTemplates.STATUS_EMOJIS.get(jobs[0][3].lower(), '❓')} {section_title} Jobs:"]
+    for job_id, site_name, area, status, notes, duration_s in jobs:
+        duration = format_duration(duration_s) if duration_s is not None else "N/A"
         sections.append(MessageTemplates.format_job_card(site_name=site_name, status=status, area=area, duration=duration, notes=notes))
     return sections
 
 async def create_job_buttons(jobs: list) -> list:
     buttons = []
-    for job in jobs:
-        if len(job) == 8:
-            job_id, site_name, scheduled_date, start_time, finish_time, status, area, notes = job
-        elif len(job) == 7:
-            job_id, site_name, area, status, notes, start_time, finish_time = job
-        else:
-            continue
-        duration = ""
-        if start_time and finish_time:
-            try:
-                duration = f" ({str(datetime.fromisoformat(finish_time) - datetime.fromisoformat(start_time)).split('.')[0]})"
-            except Exception:
-                pass
+    for job_id, site_name, area, status, notes, duration_s in jobs:
+        duration = f" ({format_duration(duration_s)})" if duration_s is not None else ""
         buttons.append([InlineKeyboardButton(f"{MessageTemplates.STATUS_EMOJIS.get(status.lower(), '❓')} {site_name}{duration}", callback_data=f"view_job_{job_id}")])
     return buttons
 
-async def build_director_assign_jobs_page(page: int, context: CallbackContext) -> tuple:
+def parse_trailing_int(data: str) -> int:
+    """The id after the last "_" in callback data"""
+    return int(data.rpartition("_")[2])
+
+def selected_job_ids(mask: int) -> list:
+    """Job ids whose bits are set in a selected_jobs mask (bit k = job k)"""
+    ids = []
+    while mask:
+        lowest = mask & -mask
+        ids.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return ids
+
+# Rendered assign-jobs pages, {(after_id, previous cursor, selection mask, JOBS_VERSION): (expires, page)};
+# JOBS_VERSION is bumped (and the stale pages dropped) whenever job assignments change here; the
+# TTL bounds how long jobs added or edited outside this process can be missing from the list
+PAGE_CACHE_MAX = 128
+PAGE_CACHE_TTL = 30
+_PAGE_CACHE = OrderedDict()
+JOBS_VERSION = 0
+
+def bump_jobs_version():
+    global JOBS_VERSION
+    JOBS_VERSION += 1
+    _PAGE_CACHE.clear()
+
+async def build_director_assign_jobs_page(after_id: int, context: CallbackContext) -> tuple:
+    """Render the page of unassigned jobs whose ids follow after_id (keyset pagination)."""
+    cursor_stack = context.user_data.get("page_cursor_stack", [0])
+    prev_cursor = cursor_stack[-2] if len(cursor_stack) > 1 else None
+    key = (after_id, prev_cursor, context.user_data.get("selected_jobs", 0), JOBS_VERSION)
+    now = time_module.monotonic()
+    cached = _PAGE_CACHE.get(key)
+    if cached and cached[0] > now:
+        _PAGE_CACHE.move_to_end(key)
+        return cached[1]
+    page = await _render_director_assign_jobs_page(after_id, prev_cursor, key[2])
+    _PAGE_CACHE[key] = (now + PAGE_CACHE_TTL, page)
+    _PAGE_CACHE.move_to_end(key)
+    if len(_PAGE_CACHE) > PAGE_CACHE_MAX:
+        _PAGE_CACHE.popitem(last=False)
+    return page
+
+async def _render_director_assign_jobs_page(after_id: int, prev_cursor, selected_jobs: int) -> tuple:
     jobs_per_page = 10
-    offset = (page - 1) * jobs_per_page
-    cursor.execute(
+    # Fetch one extra row to find out whether there is a next page
+    jobs = await db_fetchall(
         """
         SELECT id, site_name, area, status 
         FROM grounds_data 
-        WHERE assigned_to IS NULL 
+        WHERE assigned_to IS NULL AND id > ?
         ORDER BY id
-        LIMIT ? OFFSET ?
-        """, (jobs_per_page, offset)
+        LIMIT ?
+        """, (after_id, jobs_per_page + 1)
     )
-    jobs = cursor.fetchall()
+    has_next = len(jobs) > jobs_per_page
+    jobs = jobs[:jobs_per_page]
     if not jobs:
         return (
             MessageTemplates.format_success_message("No Jobs Available", "There are no unassigned jobs available."),
             InlineKeyboardMarkup([[InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="director_dashboard")]])
         )
-    selected_jobs = context.user_data.get("selected_jobs", set())
-
     # FIXED: Only show header and instructions, not the redundant job list
     text_parts = [MessageTemplates.format_job_list_header("Available Jobs", len(jobs))]
     text_parts.append("Select jobs to assign by tapping the buttons below:")
 
     keyboard = []
     for job_id, site_name, area, status in jobs:
-        is_selected = job_id in selected_jobs
+        is_selected = selected_jobs >> job_id & 1
         keyboard.append([InlineKeyboardButton(
             f"{'✅' if is_selected else '⬜️'} {site_name} ({area or 'No Area'})", 
             callback_data=f"toggle_job_{job_id}"
         )])
 
     nav_buttons = []
-    if page > 1:
-        nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"page_{page-1}"))
+    if prev_cursor is not None:
+        nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"page_{prev_cursor}"))
     nav_buttons.append(InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="director_dashboard"))
-    if len(jobs) == jobs_per_page:
-        nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"page_{page+1}"))
+    if has_next:
+        nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"page_{jobs[-1][0]}"))
     keyboard.append(nav_buttons)
     if selected_jobs:
         keyboard.append([InlineKeyboardButton("✅ Assign Selected", callback_data="assign_selected_jobs")])
@@ -307,54 +786,49 @@ async def handle_photo(update: Update, context: CallbackContext):
 
     job_id = context.user_data["awaiting_photo_for"]
     photo_file = await update.message.photo[-1].get_file()
-    photo_dir = "photos"
-    os.makedirs(photo_dir, exist_ok=True)
+    loop = asyncio.get_running_loop()
     
     # Include date in filename for better organization
-    today = datetime.now().date().isoformat()
+    today = today_iso()
     photo_filename = f"job_{job_id}_{today}_{photo_file.file_id}.jpg"
-    photo_path = os.path.join(photo_dir, photo_filename)
+    photo_path = os.path.join(PHOTO_DIR, photo_filename)
 
     try:
-        photo_bytes = await photo_file.download_as_bytearray()
-        stream = io.BytesIO(photo_bytes)
+        # Telegram already serves JPEGs, so write the file as-is instead of re-encoding it
+        await photo_file.download_to_drive(photo_path)
         try:
-            with Image.open(stream) as img:
-                img.verify()
+            mtime = await loop.run_in_executor(_io_pool, verify_photo, photo_path)
         except Exception as e:
             logger.error(f"Photo verification error: {e}")
             await update.message.reply_text("Photo verification failed.")
             return
-        stream.seek(0)
-        with Image.open(stream) as img:
-            img.save(photo_path, format='JPEG')
     except Exception as e:
         logger.error(f"Photo processing error: {e}")
         await update.message.reply_text("Photo processing failed.")
         return
 
     try:
-        cursor.execute("SELECT photos FROM grounds_data WHERE id = ?", (job_id,))
-        result = cursor.fetchone()
-        current = result[0] if result else ""
-        new_photos = current.strip() + "|" + photo_path if current and current.strip() else photo_path
-        
-        # Count today's photos
-        today_photos = filter_photos_by_date(new_photos, today)
-        today_count = len(today_photos)
-        
-        if today_count > 25:
+        # The limit check and insert run as one statement on the writer thread
+        inserted = await db_execute(
+            """
+            INSERT INTO job_photos (job_id, path, uploaded_date)
+            SELECT ?, ?, ?
+            WHERE (SELECT COUNT(*) FROM job_photos WHERE job_id = ? AND uploaded_date = ?) < ?
+            """, (job_id, photo_path, today, job_id, today, MAX_PHOTOS_PER_DAY)
+        )
+        if not inserted:
+            await loop.run_in_executor(_io_pool, os.remove, photo_path)
             await update.message.reply_text(MessageTemplates.format_error_message("Photo Limit Reached", "Maximum number of photos reached for this job."))
             return
-        
-        cursor.execute("UPDATE grounds_data SET photos = ? WHERE id = ?", (new_photos, job_id))
-        conn.commit()
+        # Telegram already has this photo, so viewers can be sent its file_id straight away
+        photo_file_id_cache[os.path.join(PHOTO_ROOT, photo_path)] = (mtime, photo_file.file_id)
+        today_count = await count_job_photos(job_id, today)
         
         # Only send confirmation if we're not in bulk upload mode
         if not context.user_data.get("bulk_upload_mode", False):
             confirmation_text = MessageTemplates.format_success_message(
                 "Photo uploaded", 
-                f"Photo uploaded for Job {job_id}. ({today_count}/25 photos uploaded today)"
+                f"Photo uploaded for Job {job_id}. ({today_count}/{MAX_PHOTOS_PER_DAY} photos uploaded today)"
             )
             keyboard = [
                 [InlineKeyboardButton("🖼️ View Today's Photos", callback_data=f"view_photos_grid_{job_id}")],
@@ -368,35 +842,35 @@ async def handle_photo(update: Update, context: CallbackContext):
         await update.message.reply_text(MessageTemplates.format_error_message("Database Error", "Failed to save photo."))
 
 
+# Shared JobHandler; cheap to build, and the callback routes bind its methods once at import
+job_handler = JobHandler()
+
 async def handle_text(update: Update, context: CallbackContext):
-    job_handler = JobHandler()
-    if "awaiting_note_for" in context.user_data:
+    note_job_id = context.user_data.get("awaiting_note_for")
+    if note_job_id is not None:
         await job_handler.handle_job_note(update, context)
     await job_handler.handle_text(update, context)
+    if note_job_id is not None:
+        invalidate_job(note_job_id)
         
 async def handle_toggle_job(update: Update, context: CallbackContext):
     data = update.callback_query.data
-    job_id = int(data.split("_")[-1])
+    job_id = parse_trailing_int(data)
     try:
-        selected_jobs = context.user_data.get("selected_jobs", set())
-        if job_id in selected_jobs:
-            selected_jobs.remove(job_id)
-        else:
-            selected_jobs.add(job_id)
-        context.user_data["selected_jobs"] = selected_jobs
-        current_page = context.user_data.get("current_page", 1)
-        text, markup = await build_director_assign_jobs_page(current_page, context)
+        context.user_data["selected_jobs"] = context.user_data.get("selected_jobs", 0) ^ (1 << job_id)
+        cursor_stack = context.user_data.get("page_cursor_stack", [0])
+        text, markup = await build_director_assign_jobs_page(cursor_stack[-1], context)
         await safe_edit_text(update, text, reply_markup=markup)
     except Exception as e:
         logger.error(f"Error toggling job: {e}")
-        await update.callback_query.answer("Error toggling job selection.", show_alert=True)
+        await answer_callback(update, "Error toggling job selection.", show_alert=True)
 
 async def reset_jobs_daily(context: CallbackContext):
     """Reset job statuses daily at 5 AM UK time"""
     logger.info("Running daily job reset at 5 AM UK time")
     try:
         # FIXED: Reset both completed and in-progress jobs
-        cursor.execute("""
+        reset_count = await db_execute("""
             UPDATE grounds_data 
             SET status = 'pending', 
                 assigned_to = NULL,
@@ -405,8 +879,11 @@ async def reset_jobs_daily(context: CallbackContext):
             WHERE status IN ('completed', 'in_progress')
             AND (scheduled_date IS NULL OR scheduled_date = date('now','localtime'))
         """)
-        conn.commit()
-        logger.info(f"Reset {cursor.rowcount} jobs")
+        logger.info(f"Reset {reset_count} jobs")
+        bump_jobs_version()
+        invalidate_emp_view()
+        invalidate_job()
+        await refresh_status_counts()
         
         # If you want to notify someone about the reset
         # await context.bot.send_message(chat_id=ADMIN_CHAT_ID, text="Daily job reset completed")
@@ -429,33 +906,64 @@ def schedule_daily_reset(application):
     )
     logger.info("Scheduled daily job reset at 5 AM UK time")
 
+# Columns used by the employee job menu and its sub-views, preloaded by emp_view_jobs
+EMP_JOB_COLUMNS = "site_name, status, notes, start_time, finish_time, area, contact, gate_code, map_link, address"
+
+# Rendered "Your Jobs" view per user: {user_id: (monotonic_ts, text, markup)}
+VIEW_CACHE_TTL = 5
+_VIEW_CACHE = {}
+
+def invalidate_emp_view(user_id=None):
+    """Forget the cached jobs view for one user, or for everyone when user_id is None"""
+    if user_id is None:
+        _VIEW_CACHE.clear()
+    else:
+        _VIEW_CACHE.pop(user_id, None)
+
+# Rows preloaded by emp_view_jobs are trusted for this long, and only while JOBS_VERSION is unchanged
+# (so a daily reset or a reassignment is never served from an old preload)
+EMP_PRELOAD_TTL = 30
+
+async def get_emp_job(context: CallbackContext, job_id: int):
+    """Return the EMP_JOB_COLUMNS row for a job, preferring the rows preloaded by emp_view_jobs."""
+    job_data = None
+    preload = context.user_data.get("jobs_by_id")
+    if preload and preload[0] == JOBS_VERSION and time_module.monotonic() - preload[1] < EMP_PRELOAD_TTL:
+        job_data = preload[2].get(job_id)
+    if job_data is None:
+        job_data = await db_fetchone(f"SELECT {EMP_JOB_COLUMNS} FROM grounds_data WHERE id = ?", (job_id,))
+    return job_data
+
 async def emp_view_jobs(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
-    cursor.execute(
-        """
-        SELECT id, site_name, area, status, notes, start_time, finish_time 
+    cached = _VIEW_CACHE.get(user_id)
+    if cached and time_module.monotonic() - cached[0] < VIEW_CACHE_TTL:
+        await safe_edit_text(update, cached[1], reply_markup=cached[2])
+        return
+    jobs = await db_fetchall(
+        f"""
+        SELECT id, {EMP_JOB_COLUMNS}
         FROM grounds_data 
         WHERE assigned_to = ? AND status != 'completed'
         ORDER BY id
         """, (user_id,)
     )
-    jobs = cursor.fetchall()
+    context.user_data["jobs_by_id"] = (JOBS_VERSION, time_module.monotonic(), {row[0]: row[1:] for row in jobs})
     if not jobs:
-        await safe_edit_text(update, MessageTemplates.format_success_message("No Jobs", "You have no assigned jobs today."))
+        message = MessageTemplates.format_success_message("No Jobs", "You have no assigned jobs today.")
+        _VIEW_CACHE[user_id] = (time_module.monotonic(), message, None)
+        await safe_edit_text(update, message)
         return
     keyboard = []
-    for job_id, site_name, area, status, notes, start_time, finish_time in jobs:
+    for job_id, site_name, status, notes, start_time, finish_time, area, *_ in jobs:
         prefix = MessageTemplates.STATUS_EMOJIS.get(status.lower(), '❓')
-        duration = ""
-        if start_time and finish_time:
-            try:
-                duration = f" ({str(datetime.fromisoformat(finish_time) - datetime.fromisoformat(start_time)).split('.')[0]})"
-            except Exception:
-                pass
+        duration = parse_times(start_time, finish_time)[3]
+        duration = f" ({duration})" if duration else ""
         keyboard.append([InlineKeyboardButton(f"{prefix}{site_name} ({area or 'No Area'}) [{status.capitalize()}]{duration}", callback_data=f"job_menu_{job_id}")])
     keyboard.append([InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="emp_employee_dashboard")])
     markup = InlineKeyboardMarkup(keyboard)
     message = MessageTemplates.format_job_list_header("Your Jobs (Today)", len(jobs))
+    _VIEW_CACHE[user_id] = (time_module.monotonic(), message, markup)
     await safe_edit_text(update, message, reply_markup=markup)
 
 async def emp_employee_dashboard(update: Update, context: CallbackContext):
@@ -471,13 +979,8 @@ async def emp_employee_dashboard(update: Update, context: CallbackContext):
     await safe_edit_text(update, text, reply_markup=markup)
 
 async def emp_job_menu(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
-    cursor.execute(
-        "SELECT site_name, status, notes, start_time, finish_time, area, contact, gate_code, map_link, photos, address "
-        "FROM grounds_data WHERE id = ?", 
-        (job_id,)
-    )
-    job_data = cursor.fetchone()
+    job_id = parse_trailing_int(update.callback_query.data)
+    job_data = await get_emp_job(context, job_id)
 
     if not job_data:
         # Updated error message formatting
@@ -488,26 +991,25 @@ async def emp_job_menu(update: Update, context: CallbackContext):
         await safe_edit_text(update, error_msg)
         return
 
-    site_name, status, notes, start_time, finish_time, area, contact, gate_code, map_link, photos, address = job_data
+    site_name, status, notes, start_time, finish_time, area, contact, gate_code, map_link, address = job_data
     
     # Get today's photos count
-    today = datetime.now().date().isoformat()
-    today_photos = filter_photos_by_date(photos, today)
-    photo_count = len(today_photos)
+    today = today_iso()
+    photo_count = await count_job_photos(job_id, today)
 
     # FIXED: Ensure notes are properly passed to format_job_card
     sections = [MessageTemplates.format_job_card(
         site_name=site_name, 
         status=status, 
         area=area,
-        duration=(str(datetime.fromisoformat(finish_time) - datetime.fromisoformat(start_time)).split('.')[0] 
-                 if start_time and finish_time else "N/A"),
+        duration=parse_times(start_time, finish_time)[3] or "N/A",
         notes=notes,
         photo_count=photo_count
     )]
 
     # Add weather forecast for outdoor jobs
-    if area and any(outdoor_term in area.lower() for outdoor_term in ["garden", "outdoor", "yard", "field", "grounds", "exterior"]):
+    is_outdoor = bool(area and OUTDOOR_RE.search(area))
+    if is_outdoor:
         # Use address if available, otherwise use site name + UK
         location = address if address else f"{site_name},UK"
         weather_data = await get_weather_forecast(location)
@@ -534,7 +1036,7 @@ async def emp_job_menu(update: Update, context: CallbackContext):
         keyboard.append([InlineKeyboardButton(f"🖼️ View Today's Photos ({photo_count})", callback_data=f"view_photos_grid_{job_id}")])
 
     # Add weather refresh button for outdoor jobs
-    if area and any(outdoor_term in area.lower() for outdoor_term in ["garden", "outdoor", "yard", "field", "grounds", "exterior"]):
+    if is_outdoor:
         keyboard.append([InlineKeyboardButton("🌤️ Refresh Weather", callback_data=f"refresh_weather_{job_id}")])
 
     keyboard.append([InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="emp_view_jobs")])
@@ -542,10 +1044,9 @@ async def emp_job_menu(update: Update, context: CallbackContext):
     await safe_edit_text(update, "\n\n".join(sections), reply_markup=markup)
 
 async def emp_start_job(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
+    job_id = parse_trailing_int(update.callback_query.data)
     try:
-        cursor.execute("SELECT status FROM grounds_data WHERE id = ?", (job_id,))
-        result = cursor.fetchone()
+        result = await db_fetchone(SQL_JOB_STATUS, (job_id,))
         if not result:
             await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found.", "JOB_404"))
             return
@@ -553,8 +1054,11 @@ async def emp_start_job(update: Update, context: CallbackContext):
         if current_status == 'in_progress':
             await safe_edit_text(update, MessageTemplates.format_error_message("Already Started", "This job is already in progress.", "JOB_IN_PROGRESS"))
             return
-        cursor.execute("UPDATE grounds_data SET status = 'in_progress', start_time = ? WHERE id = ?", (datetime.now().isoformat(), job_id))
-        conn.commit()
+        await db_execute(SQL_START_JOB, (datetime.now().isoformat(), job_id))
+        invalidate_job(job_id)
+        move_status_count(current_status, 'in_progress')
+        context.user_data.pop("jobs_by_id", None)
+        invalidate_emp_view(update.effective_user.id)
         await safe_edit_text(update, MessageTemplates.format_success_message("Job Started", f"Job {job_id} has been started."))
         await emp_view_jobs(update, context)
     except sqlite3.Error as e:
@@ -562,10 +1066,9 @@ async def emp_start_job(update: Update, context: CallbackContext):
         await safe_edit_text(update, MessageTemplates.format_error_message("Database Error", "Failed to start job. Please try again.", "DB_ERROR"))
 
 async def emp_finish_job(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
+    job_id = parse_trailing_int(update.callback_query.data)
     try:
-        cursor.execute("SELECT status FROM grounds_data WHERE id = ?", (job_id,))
-        result = cursor.fetchone()
+        result = await db_fetchone(SQL_JOB_STATUS, (job_id,))
         if not result:
             await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found.", "JOB_404"))
             return
@@ -576,8 +1079,11 @@ async def emp_finish_job(update: Update, context: CallbackContext):
         if current_status != 'in_progress':
             await safe_edit_text(update, MessageTemplates.format_error_message("Not Started", "This job has not been started yet.", "JOB_NOT_STARTED"))
             return
-        cursor.execute("UPDATE grounds_data SET status = 'completed', finish_time = ? WHERE id = ?", (datetime.now().isoformat(), job_id))
-        conn.commit()
+        await db_execute(SQL_FINISH_JOB, (datetime.now().isoformat(), job_id))
+        invalidate_job(job_id)
+        move_status_count(current_status, 'completed')
+        context.user_data.pop("jobs_by_id", None)
+        invalidate_emp_view(update.effective_user.id)
         await safe_edit_text(update, MessageTemplates.format_success_message("Job Completed", f"Job {job_id} has been completed."))
         await emp_view_jobs(update, context)
     except sqlite3.Error as e:
@@ -585,16 +1091,14 @@ async def emp_finish_job(update: Update, context: CallbackContext):
         await safe_edit_text(update, MessageTemplates.format_error_message("Database Error", "Failed to complete job. Please try again.", "DB_ERROR"))
 
 async def emp_upload_photo(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
+    job_id = parse_trailing_int(update.callback_query.data)
     
     # Check today's photo count
-    cursor.execute("SELECT photos FROM grounds_data WHERE id = ?", (job_id,))
-    photos_str = cursor.fetchone()[0] or ""
-    today = datetime.now().date().isoformat()
-    today_count = count_photos_for_date(photos_str, today)
+    today = today_iso()
+    today_count = await count_job_photos(job_id, today)
     
-    if today_count >= 25:
-        await safe_edit_text(update, MessageTemplates.format_error_message("Photo Limit Reached", "Maximum number of photos (25) reached for this job today."))
+    if today_count >= MAX_PHOTOS_PER_DAY:
+        await safe_edit_text(update, MessageTemplates.format_error_message("Photo Limit Reached", f"Maximum number of photos ({MAX_PHOTOS_PER_DAY}) reached for this job today."))
         return
     
     context.user_data["awaiting_photo_for"] = job_id
@@ -614,32 +1118,29 @@ async def emp_upload_photo(update: Update, context: CallbackContext):
     )
 
 async def finish_photo_upload(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
+    job_id = parse_trailing_int(update.callback_query.data)
 
     # Clean up context data
     context.user_data.pop("awaiting_photo_for", None)
     context.user_data.pop("bulk_upload_mode", None)
 
     # Get photo count for confirmation
-    cursor.execute("SELECT photos FROM grounds_data WHERE id = ?", (job_id,))
-    photos_str = cursor.fetchone()[0] or ""
-    today = datetime.now().date().isoformat()
-    today_count = count_photos_for_date(photos_str, today)
+    today = today_iso()
+    today_count = await count_job_photos(job_id, today)
     
     # Show brief confirmation
-    await update.callback_query.answer(f"Upload complete: {today_count} photos today", show_alert=False)
+    await answer_callback(update, f"Upload complete: {today_count} photos today", show_alert=False)
     
     # Return directly to job menu without additional messages
     await emp_job_menu(update, context)
 
 async def emp_site_info(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
-    cursor.execute("SELECT site_name, contact, gate_code, address FROM grounds_data WHERE id = ?", (job_id,))
-    job_data = cursor.fetchone()
+    job_id = parse_trailing_int(update.callback_query.data)
+    job_data = await get_emp_job(context, job_id)
     if not job_data:
         await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found.", "JOB_404"))
         return
-    site_name, contact, gate_code, address = job_data
+    site_name, contact, gate_code, address = job_data[0], job_data[6], job_data[7], job_data[9]
     contact, gate_code = update_site_info(site_name, contact, gate_code)
     info_text = MessageTemplates.format_site_info(site_name=site_name, contact=contact, gate_code=gate_code, address=address, special_instructions=None)
     keyboard = [[InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data=f"job_menu_{job_id}")]]
@@ -647,13 +1148,12 @@ async def emp_site_info(update: Update, context: CallbackContext):
     await safe_edit_text(update, info_text, reply_markup=markup)
 
 async def emp_map_link(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
-    cursor.execute("SELECT site_name, map_link FROM grounds_data WHERE id = ?", (job_id,))
-    job_data = cursor.fetchone()
+    job_id = parse_trailing_int(update.callback_query.data)
+    job_data = await get_emp_job(context, job_id)
     if not job_data:
         await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found.", "JOB_404"))
         return
-    site_name, map_link = job_data
+    site_name, map_link = job_data[0], job_data[8]
     if not map_link:
         await safe_edit_text(update, MessageTemplates.format_error_message("No Map Link", "No map link available for this job.", "NO_MAP_LINK"))
         return
@@ -661,49 +1161,58 @@ async def emp_map_link(update: Update, context: CallbackContext):
     markup = InlineKeyboardMarkup(keyboard)
     await safe_edit_text(update, f"🗺 Map Link for {site_name}:\n{map_link}", reply_markup=markup)
 
+#####################################
+# STATIC KEYBOARDS
+#####################################
+
+# Markups that never change after startup, built once instead of per callback
+DIRECTOR_DASHBOARD_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Assign Jobs", callback_data="dir_assign_jobs_list")],
+    [InlineKeyboardButton("View Completed Jobs", callback_data="calendar_view")]
+])
+ADD_NOTES_CANCEL_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton(f"{ButtonLayouts.DANGER_PREFIX} Cancel", callback_data="director_dashboard")]
+])
+ASSIGN_EMPLOYEE_KB = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(f"Assign to {emp_name}", callback_data=f"assign_to_{emp_id}")] for emp_id, emp_name in employee_users.items()]
+    + [[InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="director_dashboard")]]
+)
+CALENDAR_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Andy", callback_data="view_completed_jobs_1672989849")],
+    [InlineKeyboardButton("Alex", callback_data=f"view_completed_jobs_{alex_id}")],
+    [InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="director_dashboard")]
+])
+DEV_DASHBOARD_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Director Dashboard", callback_data="dev_director_dashboard")],
+    [InlineKeyboardButton("Employee Dashboard", callback_data="dev_employee_dashboard")]
+])
+
 #####################################
 # DIRECTOR FUNCTIONS
 #####################################
 
 async def director_send_job(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
-    cursor.execute(
-        """
-        SELECT site_name, photos, start_time, finish_time, notes, contact, gate_code, map_link, area, address, status 
-        FROM grounds_data 
-        WHERE id = ?
-        """, (job_id,)
-    )
-    row = cursor.fetchone()
+    job_id = parse_trailing_int(update.callback_query.data)
+    row = await get_job(job_id, SQL_JOB_DETAILS)
     if not row:
         await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found."))
         return
 
-    site_name, photos, start_time, finish_time, notes, contact, gate_code, map_link, area, address, status = row
+    site_name, start_time, finish_time, notes, contact, gate_code, map_link, area, address, status = row
     contact, gate_code = update_site_info(site_name, contact, gate_code)
 
-    # Determine which date's photos to show
-    photo_date = None
-    if finish_time:
-        try:
-            finish_datetime = datetime.fromisoformat(finish_time)
-            photo_date = finish_datetime.date().isoformat()
-        except Exception as e:
-            logger.error(f"Error parsing finish time: {e}")
-            photo_date = datetime.now().date().isoformat()
-    else:
-        photo_date = datetime.now().date().isoformat()
+    # Photos are shown for the finish date (today while the job is still open)
+    _, _, photo_date, duration = parse_times(start_time, finish_time)
+    duration = duration or "N/A"
     
-    # Filter photos by date
-    photo_paths = filter_photos_by_date(photos, photo_date)
+    # Fetch photos for that date
+    photo_paths = await get_job_photos(job_id, photo_date)
     photo_count = len(photo_paths)
-
-    duration = "N/A"
-    if start_time and finish_time:
-        try:
-            duration = str(datetime.fromisoformat(finish_time) - datetime.fromisoformat(start_time)).split('.')[0]
-        except Exception:
-            duration = "N/A"
+    # Hand the list to view_job_photos_grid so "View Photos" needs no further queries;
+    # only the last opened job is kept so user_data stays bounded
+    context.user_data["prefetched_photos"] = (
+        job_id, time_module.monotonic(), photo_date, photo_paths, site_name
+    )
 
     # FIXED: Ensure notes are properly passed to format_job_card
     sections = [MessageTemplates.format_job_card(
@@ -715,8 +1224,10 @@ async def director_send_job(update: Update, context: CallbackContext):
         photo_count=photo_count
     )]
 
+    is_outdoor = bool(area and OUTDOOR_RE.search(area))
+
     # Add weather forecast for outdoor jobs
-    if area and any(outdoor_term in area.lower() for outdoor_term in ["garden", "outdoor", "yard", "field", "grounds", "exterior"]):
+    if is_outdoor:
         # Use address if available, otherwise use site name + UK
         location = address if address else f"{site_name},UK"
         weather_data = await get_weather_forecast(location)
@@ -736,11 +1247,11 @@ async def director_send_job(update: Update, context: CallbackContext):
 
     # Add photo viewing button if there are photos
     if photo_count > 0:
-        date_str = "today" if photo_date == datetime.now().date().isoformat() else photo_date
+        date_str = "today" if photo_date == today_iso() else photo_date
         keyboard.append([InlineKeyboardButton(f"🖼️ View Photos ({photo_count}) from {date_str}", callback_data=f"view_photos_grid_{job_id}")])
 
     # Add weather refresh button for outdoor jobs
-    if area and any(outdoor_term in area.lower() for outdoor_term in ["garden", "outdoor", "yard", "field", "grounds", "exterior"]):
+    if is_outdoor:
         keyboard.append([InlineKeyboardButton("🌤️ Refresh Weather", callback_data=f"refresh_weather_{job_id}")])
 
     keyboard.append([InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="calendar_view")])
@@ -748,53 +1259,33 @@ async def director_send_job(update: Update, context: CallbackContext):
 
     if photo_paths:
         media_group = []
-        for p in photo_paths:
-            abs_path = os.path.join(os.getcwd(), p.strip())
-            if os.path.exists(abs_path):
-                try:
-                    media_group.append(InputMediaPhoto(media=open(abs_path, 'rb')))
-                except Exception as e:
-                    logger.error(f"Error preparing photo for job {job_id}: {e}")
-            else:
+        sent = []
+        abs_paths = [os.path.join(PHOTO_ROOT, p.strip()) for p in photo_paths]
+        loaded = await photo_media_batch(abs_paths)
+        for abs_path, result in zip(abs_paths, loaded):
+            if isinstance(result, FileNotFoundError):
                 logger.warning(f"Photo file not found: {abs_path}")
+            elif isinstance(result, Exception):
+                logger.error(f"Error preparing photo for job {job_id}: {result}")
+            else:
+                media, mtime = result
+                media_group.append(InputMediaPhoto(media=media))
+                sent.append((abs_path, mtime))
         
         if media_group:
-            max_items = 10
-            chunks = [media_group[i:i + max_items] for i in range(0, len(media_group), max_items)]
-            for index, chunk in enumerate(chunks):
-                if index == 0:
-                    if len(chunk) == 1:
-                        try:
-                            await update.effective_message.reply_photo(
-                                photo=chunk[0].media, 
-                                caption="\n\n".join(sections), 
-                                reply_markup=markup
-                            )
-                        except Exception as e:
-                            logger.error(f"Error sending photo: {e}")
-                    else:
-                        try:
-                            await update.effective_message.reply_media_group(media=chunk)
-                            await update.effective_message.reply_text(
-                                "\n\n".join(sections), 
-                                reply_markup=markup
-                            )
-                        except Exception as e:
-                            logger.error(f"Error sending media group: {e}")
-                else:
-                    try:
-                        await update.effective_message.reply_media_group(media=chunk)
-                    except Exception as e:
-                        logger.error(f"Error sending additional media group: {e}")
+            try:
+                await _send_media_pages(update.effective_message, media_group, sent, "\n\n".join(sections), markup)
+            except Exception as e:
+                logger.error(f"Error sending job photos: {e}")
         else:
             await safe_edit_text(update, "\n\n".join(sections), reply_markup=markup)
     else:
         await safe_edit_text(update, "\n\n".join(sections), reply_markup=markup)
 
 async def director_assign_jobs_list(update: Update, context: CallbackContext):
-    context.user_data["selected_jobs"] = set()
-    context.user_data["current_page"] = 1
-    text, markup = await build_director_assign_jobs_page(1, context)
+    context.user_data["selected_jobs"] = 0
+    context.user_data["page_cursor_stack"] = [0]
+    text, markup = await build_director_assign_jobs_page(0, context)
     await safe_edit_text(update, text, reply_markup=markup)
 
 async def director_select_day_for_assignment(update: Update, context: CallbackContext):
@@ -805,9 +1296,10 @@ async def director_assign_day_selected(update: Update, context: CallbackContext)
 
 async def director_dashboard(update: Update, context: CallbackContext):
     header = MessageTemplates.format_dashboard_header("Director", "Director")
-    total_jobs = len(cursor.execute("SELECT id FROM grounds_data").fetchall())
-    active_jobs = len(cursor.execute("SELECT id FROM grounds_data WHERE status = 'in_progress'").fetchall())
-    completed_jobs = len(cursor.execute("SELECT id FROM grounds_data WHERE status = 'completed'").fetchall())
+    # Served from the in-memory counters; no query on the landing screen
+    total_jobs = sum(_status_counts.values())
+    active_jobs = _status_counts.get('in_progress', 0)
+    completed_jobs = _status_counts.get('completed', 0)
     stats = [
         f"📊 Today's Overview:",
         f"• Total Jobs: {total_jobs}",
@@ -816,26 +1308,19 @@ async def director_dashboard(update: Update, context: CallbackContext):
         MessageTemplates.SEPARATOR
     ]
     message_text = f"{header}\n\n" + "\n".join(stats)
-    director_kb = InlineKeyboardMarkup([
-        [InlineKeyboardButton("Assign Jobs", callback_data="dir_assign_jobs_list")],
-        [InlineKeyboardButton("View Completed Jobs", callback_data="calendar_view")]
-    ])
-    await safe_edit_text(update, message_text, reply_markup=director_kb)
+    await safe_edit_text(update, message_text, reply_markup=DIRECTOR_DASHBOARD_KB)
 
 async def director_add_notes(update: Update, context: CallbackContext):
     if "selected_jobs" not in context.user_data or not context.user_data["selected_jobs"]:
         await safe_edit_text(update, MessageTemplates.format_error_message("No Jobs Selected", "Please select jobs before assigning."))
         return
     context.user_data["awaiting_notes"] = True
-    keyboard = [[InlineKeyboardButton(f"{ButtonLayouts.DANGER_PREFIX} Cancel", callback_data="director_dashboard")]]
-    markup = InlineKeyboardMarkup(keyboard)
-    await safe_edit_text(update, "Please send the notes for the selected jobs:", reply_markup=markup)
+    await safe_edit_text(update, "Please send the notes for the selected jobs:", reply_markup=ADD_NOTES_CANCEL_KB)
 
 async def director_edit_note(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
+    job_id = parse_trailing_int(update.callback_query.data)
     try:
-        cursor.execute("SELECT site_name FROM grounds_data WHERE id = ?", (job_id,))
-        result = cursor.fetchone()
+        result = await get_job(job_id, SQL_JOB_SITE_NAME)
         if not result:
             await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found."))
             return
@@ -855,24 +1340,27 @@ async def director_assign_jobs(update: Update, context: CallbackContext):
     if "selected_jobs" not in context.user_data or not context.user_data["selected_jobs"]:
         await safe_edit_text(update, MessageTemplates.format_error_message("No Jobs Selected", "Please select jobs before assigning."))
         return
-    keyboard = []
-    for emp_id, emp_name in employee_users.items():
-        keyboard.append([InlineKeyboardButton(f"Assign to {emp_name}", callback_data=f"assign_to_{emp_id}")])
-    keyboard.append([InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="director_dashboard")])
-    markup = InlineKeyboardMarkup(keyboard)
     message = MessageTemplates.format_success_message("Select Employee", "Please choose an employee to assign the selected jobs.")
-    await safe_edit_text(update, message, reply_markup=markup)
+    await safe_edit_text(update, message, reply_markup=ASSIGN_EMPLOYEE_KB)
 
 async def assign_jobs_to_employee(update: Update, context: CallbackContext):
-    employee_id = int(update.callback_query.data.split("_")[-1])
-    selected_jobs = context.user_data.get("selected_jobs", set())
+    employee_id = parse_trailing_int(update.callback_query.data)
+    selected_jobs = context.user_data.get("selected_jobs", 0)
     if not selected_jobs:
         await safe_edit_text(update, MessageTemplates.format_error_message("No Jobs Selected", "Please select jobs before assigning."))
         return
+    job_ids = selected_job_ids(selected_jobs)
     try:
-        for job_id in selected_jobs:
-            cursor.execute("UPDATE grounds_data SET assigned_to = ? WHERE id = ?", (employee_id, job_id))
-        conn.commit()
+        # One statement per chunk of ids, all applied in a single savepoint so a failure assigns nothing
+        chunks = [job_ids[i:i + ASSIGN_CHUNK_SIZE] for i in range(0, len(job_ids), ASSIGN_CHUNK_SIZE)]
+        await db_execute_atomic([
+            (f"UPDATE grounds_data SET assigned_to = ? WHERE id IN ({','.join('?' * len(chunk))})", (employee_id, *chunk))
+            for chunk in chunks
+        ])
+        bump_jobs_version()
+        invalidate_emp_view(employee_id)
+        for job_id in job_ids:
+            invalidate_job(job_id)
         message = MessageTemplates.format_success_message("Jobs Assigned", f"Selected jobs have been assigned to {employee_users.get(employee_id, 'Employee')}.")
         await safe_edit_text(update, message)
         if "selected_jobs" in context.user_data:
@@ -883,59 +1371,30 @@ async def assign_jobs_to_employee(update: Update, context: CallbackContext):
         await safe_edit_text(update, MessageTemplates.format_error_message("Database Error", "Failed to assign jobs. Please try again."))
 
 async def director_calendar_view(update: Update, context: CallbackContext):
-    # Log the employee IDs for debugging
-    logger.info(f"Employee users: {employee_users}")
-
-    # Get Alex's ID from the employee_users dictionary
-    alex_id = None
-    for emp_id, name in employee_users.items():
-        if name.lower() == "alex":
-            alex_id = emp_id
-            break
-
-    if not alex_id:
-        logger.error("Alex's ID not found in employee_users dictionary")
-        alex_id = -7747082939  # Fallback to the ID you provided
-
-    logger.info(f"Using Alex ID: {alex_id}")
-
-    kb = InlineKeyboardMarkup([
-         [InlineKeyboardButton("Andy", callback_data="view_completed_jobs_1672989849")],
-         [InlineKeyboardButton("Alex", callback_data=f"view_completed_jobs_{alex_id}")],
-         [InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="director_dashboard")]
-    ])
-    await safe_edit_text(update, "Select an employee to view completed jobs:", reply_markup=kb)
+    # Alex's ID is resolved (with its fallback) once at startup
+    await safe_edit_text(update, "Select an employee to view completed jobs:", reply_markup=CALENDAR_KB)
 
 #####################################
 # PHOTO VIEWING FUNCTIONS
 #####################################
 
 async def view_job_photos(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
-    cursor.execute("SELECT photos, site_name, finish_time FROM grounds_data WHERE id = ?", (job_id,))
-    result = cursor.fetchone()
-    if not result or not result[0]:
+    job_id = parse_trailing_int(update.callback_query.data)
+    result = await get_job(job_id, SQL_JOB_SITE_FINISH)
+    if not result:
         await safe_edit_text(update, MessageTemplates.format_error_message("No Photos", "No photos available for this job."))
         return
 
-    photos, site_name, finish_time = result
+    site_name, finish_time = result
     
-    # Determine which date's photos to show
-    photo_date = None
-    if finish_time:
-        try:
-            finish_datetime = datetime.fromisoformat(finish_time)
-            photo_date = finish_datetime.date().isoformat()
-        except Exception:
-            photo_date = datetime.now().date().isoformat()
-    else:
-        photo_date = datetime.now().date().isoformat()
+    # Photos are shown for the finish date (today while the job is still open)
+    photo_date = parse_times(None, finish_time)[2]
     
-    # Filter photos by date
-    photo_paths = filter_photos_by_date(photos, photo_date)
+    # Fetch photos for that date
+    photo_paths = await get_job_photos(job_id, photo_date)
     
     if not photo_paths:
-        date_str = "today" if photo_date == datetime.now().date().isoformat() else photo_date
+        date_str = "today" if photo_date == today_iso() else photo_date
         await safe_edit_text(update, MessageTemplates.format_error_message(
             "No Photos", 
             f"No photos available for this job on {date_str}."
@@ -949,61 +1408,63 @@ async def view_job_photos(update: Update, context: CallbackContext):
     context.user_data["photo_date"] = photo_date
 
     # Show first photo with navigation
-    date_str = "today" if photo_date == datetime.now().date().isoformat() else photo_date
+    date_str = "today" if photo_date == today_iso() else photo_date
     await show_single_photo(update, context, photo_paths[0], f"{site_name} ({date_str})", 0, len(photo_paths))
 
 async def show_single_photo(update: Update, context: CallbackContext, photo_path: str, site_name: str, index: int, total: int):
     try:
-        with open(photo_path, 'rb') as photo_file:
-            keyboard = []
-            nav_buttons = []
-            
-            if index > 0:
-                nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"photo_nav_{index-1}"))
-            
-            nav_buttons.append(InlineKeyboardButton(f"{index+1}/{total}", callback_data="noop"))
-            
-            if index < total - 1:
-                nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"photo_nav_{index+1}"))
-            
-            keyboard.append(nav_buttons)
-            keyboard.append([InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back to Job", callback_data=f"view_job_{context.user_data['job_id']}")])
-            
-            markup = InlineKeyboardMarkup(keyboard)
-            
-            try:
-                await update.effective_message.reply_photo(
-                    photo=photo_file,
-                    caption=f"📸 {site_name} (Photo {index+1}/{total})",
-                    reply_markup=markup
-                )
-                await update.effective_message.delete()
-            except BadRequest:
-                await update.effective_message.reply_photo(
-                    photo=photo_file,
-                    caption=f"📸 {site_name} (Photo {index+1}/{total})",
-                    reply_markup=markup
-                )
+        abs_path = os.path.join(PHOTO_ROOT, photo_path.strip())
+        photo_file, mtime = await photo_media(abs_path)
+        keyboard = []
+        nav_buttons = []
+        
+        if index > 0:
+            nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"photo_nav_{index-1}"))
+        
+        nav_buttons.append(InlineKeyboardButton(f"{index+1}/{total}", callback_data="noop"))
+        
+        if index < total - 1:
+            nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"photo_nav_{index+1}"))
+        
+        keyboard.append(nav_buttons)
+        keyboard.append([InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back to Job", callback_data=f"view_job_{context.user_data['job_id']}")])
+        
+        markup = InlineKeyboardMarkup(keyboard)
+        
+        try:
+            message = await update.effective_message.reply_photo(
+                photo=photo_file,
+                caption=f"📸 {site_name} (Photo {index+1}/{total})",
+                reply_markup=markup
+            )
+            await update.effective_message.delete()
+        except BadRequest:
+            message = await update.effective_message.reply_photo(
+                photo=photo_file,
+                caption=f"📸 {site_name} (Photo {index+1}/{total})",
+                reply_markup=markup
+            )
+        remember_file_ids([(abs_path, mtime)], [message])
     except Exception as e:
         logger.error(f"Error displaying photo: {e}")
         await safe_edit_text(update, MessageTemplates.format_error_message("Photo Error", "Could not display the photo."))
 
 async def handle_photo_navigation(update: Update, context: CallbackContext):
     data = update.callback_query.data
-    new_index = int(data.split("_")[-1])
+    new_index = parse_trailing_int(data)
     photo_paths = context.user_data.get("job_photos", [])
 
     if not photo_paths or new_index < 0 or new_index >= len(photo_paths):
-        await update.callback_query.answer("Invalid photo navigation", show_alert=True)
+        await answer_callback(update, "Invalid photo navigation", show_alert=True)
         return
+    await answer_callback(update)
 
     context.user_data["current_photo_index"] = new_index
-    cursor.execute("SELECT site_name FROM grounds_data WHERE id = ?", (context.user_data["job_id"],))
-    site_name = cursor.fetchone()[0]
+    site_name = (await get_job(context.user_data["job_id"], SQL_JOB_SITE_NAME))[0]
     
     # Include date in the site name
-    photo_date = context.user_data.get("photo_date", datetime.now().date().isoformat())
-    date_str = "today" if photo_date == datetime.now().date().isoformat() else photo_date
+    photo_date = context.user_data.get("photo_date", today_iso())
+    date_str = "today" if photo_date == today_iso() else photo_date
     display_name = f"{site_name} ({date_str})"
 
     await show_single_photo(update, context, photo_paths[new_index], display_name, new_index, len(photo_paths))
@@ -1013,16 +1474,17 @@ async def director_view_completed_jobs(update: Update, context: CallbackContext,
     logger.info(f"Viewing completed jobs for employee: {employee_name} (ID: {employee_id})")
 
     # FIX: Modified query to properly fetch completed jobs for any employee
-    cursor.execute(
+    jobs = await db_fetchall(
         """
-        SELECT id, site_name, area, status, notes, start_time, finish_time, photos
-        FROM grounds_data 
-        WHERE assigned_to = ? AND status = 'completed'
-        ORDER BY finish_time DESC
+        SELECT g.id, g.site_name, g.area, g.status, g.notes, g.start_time, g.finish_time,
+            (SELECT COUNT(*) FROM job_photos p
+             WHERE p.job_id = g.id AND p.uploaded_date = date(g.finish_time)) AS photo_count
+        FROM grounds_data g
+        WHERE g.assigned_to = ? AND g.status = 'completed'
+        ORDER BY g.finish_time DESC
         LIMIT 20
         """, (employee_id,)
     )
-    jobs = cursor.fetchall()
 
     # More debug logging
     logger.info(f"Found {len(jobs) if jobs else 0} completed jobs for {employee_name}")
@@ -1034,28 +1496,12 @@ async def director_view_completed_jobs(update: Update, context: CallbackContext,
         return
 
     sections = [MessageTemplates.format_job_list_header(f"{employee_name}'s Completed Jobs", len(jobs))]
+    buttons = []
 
     for job in jobs:
-        job_id, site_name, area, status, notes, start_time, finish_time, photos = job
+        job_id, site_name, area, status, notes, start_time, finish_time, photo_count = job
         
-        # Format duration
-        duration = "N/A"
-        if start_time and finish_time:
-            try:
-                duration = str(datetime.fromisoformat(finish_time) - datetime.fromisoformat(start_time))
-                duration = str(duration).split('.')[0]
-            except Exception:
-                pass
-        
-        # Get photo count for the completion date
-        photo_count = 0
-        if finish_time:
-            try:
-                finish_datetime = datetime.fromisoformat(finish_time)
-                photo_date = finish_datetime.date().isoformat()
-                photo_count = count_photos_for_date(photos, photo_date)
-            except Exception as e:
-                logger.error(f"Error getting photo count: {e}")
+        duration = parse_times(start_time, finish_time)[3] or "N/A"
         
         # Format job details
         job_details = MessageTemplates.format_job_card(
@@ -1068,21 +1514,6 @@ async def director_view_completed_jobs(update: Update, context: CallbackContext,
         )
         
         sections.append(job_details)
-
-    # Create buttons for each job
-    buttons = []
-    for job in jobs:
-        job_id, site_name, _, _, _, _, finish_time, photos = job
-        
-        # Get photo count for the completion date
-        photo_count = 0
-        if finish_time:
-            try:
-                finish_datetime = datetime.fromisoformat(finish_time)
-                photo_date = finish_datetime.date().isoformat()
-                photo_count = count_photos_for_date(photos, photo_date)
-            except Exception as e:
-                logger.error(f"Error getting photo count: {e}")
         
         button_text = f"{site_name} ({photo_count} 📸)" if photo_count > 0 else site_name
         buttons.append([InlineKeyboardButton(button_text, callback_data=f"view_job_{job_id}")])
@@ -1093,33 +1524,29 @@ async def director_view_completed_jobs(update: Update, context: CallbackContext,
 
 async def view_job_photos_grid(update: Update, context: CallbackContext):
     """View all job photos in a grid format (10 photos per message)"""
-    job_id = int(update.callback_query.data.split('_')[-1])
+    job_id = parse_trailing_int(update.callback_query.data)
 
-    # Get the job completion date or today's date
-    cursor.execute("SELECT site_name, finish_time, photos FROM grounds_data WHERE id = ?", (job_id,))
-    result = cursor.fetchone()
-    if not result:
-        await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found."))
-        return
-
-    site_name, finish_time, photos = result
-    
-    # Determine which date's photos to show
-    photo_date = None
-    if finish_time:
-        try:
-            finish_datetime = datetime.fromisoformat(finish_time)
-            photo_date = finish_datetime.date().isoformat()
-        except Exception:
-            photo_date = datetime.now().date().isoformat()
+    # Reuse what director_send_job just loaded for this job, if it is recent
+    prefetched = context.user_data.pop("prefetched_photos", None)
+    if prefetched and prefetched[0] == job_id and time_module.monotonic() - prefetched[1] < JOB_CACHE_TTL:
+        _, _, photo_date, photo_paths, site_name = prefetched
     else:
-        photo_date = datetime.now().date().isoformat()
-    
-    # Filter photos by date
-    photo_paths = filter_photos_by_date(photos, photo_date)
+        # Get the job completion date or today's date
+        result = await get_job(job_id, SQL_JOB_SITE_FINISH)
+        if not result:
+            await safe_edit_text(update, MessageTemplates.format_error_message("Job not found", "The requested job was not found."))
+            return
+
+        site_name, finish_time = result
+        
+        # Photos are shown for the finish date (today while the job is still open)
+        photo_date = parse_times(None, finish_time)[2]
+        
+        # Fetch photos for that date
+        photo_paths = await get_job_photos(job_id, photo_date)
     
     if not photo_paths:
-        date_str = "today" if photo_date == datetime.now().date().isoformat() else photo_date
+        date_str = "today" if photo_date == today_iso() else photo_date
         await safe_edit_text(update, MessageTemplates.format_error_message(
             "No Photos", 
             f"No photos available for this job on {date_str}."
@@ -1135,6 +1562,18 @@ async def view_job_photos_grid(update: Update, context: CallbackContext):
     # Send first grid
     await send_photo_grid(update, context)
 
+# Next grid page read in the background per user: {user_id: ((job_id, photo_date, page), task)}.
+# Kept out of user_data (tasks don't pickle) and dropped after GRID_PREFETCH_TTL so unused pages of
+# photo bytes aren't pinned
+GRID_PREFETCH_TTL = 30
+_grid_prefetch = {}
+
+def _expire_grid_prefetch(user_id: int, task: asyncio.Task):
+    entry = _grid_prefetch.get(user_id)
+    if entry and entry[1] is task:
+        del _grid_prefetch[user_id]
+        task.cancel()
+
 async def send_photo_grid(update: Update, context: CallbackContext):
     """Send a grid of up to 10 photos with navigation controls"""
     photo_paths = context.user_data.get("job_photos", [])
@@ -1154,17 +1593,36 @@ async def send_photo_grid(update: Update, context: CallbackContext):
 
     # Prepare media group
     media_group = []
-    for idx, photo_path in enumerate(current_photos, start=1):
-        try:
-            abs_path = os.path.join(os.getcwd(), photo_path.strip())
-            if os.path.exists(abs_path):
-                caption = f"📸 {idx + start_idx}/{len(photo_paths)}" if idx == 1 else ""
-                media_group.append(InputMediaPhoto(
-                    media=open(abs_path, 'rb'),
-                    caption=caption
-                ))
-        except Exception as e:
-            logger.error(f"Error loading photo {photo_path}: {e}")
+    sent = []
+    abs_paths = [os.path.join(PHOTO_ROOT, photo_path.strip()) for photo_path in current_photos]
+    # Read the whole page in one go (or pick up the read started while the last page was sending);
+    # missing files just drop out of the grid
+    user_id = update.effective_user.id
+    prefetch = _grid_prefetch.pop(user_id, None)
+    if prefetch and prefetch[0] == (job_id, photo_date, current_page):
+        loaded = await prefetch[1]
+    else:
+        if prefetch:
+            prefetch[1].cancel()
+        loaded = await photo_media_batch(abs_paths)
+    if end_idx < len(photo_paths):
+        next_paths = [os.path.join(PHOTO_ROOT, p.strip()) for p in photo_paths[end_idx:end_idx + photos_per_page]]
+        task = asyncio.create_task(photo_media_batch(next_paths))
+        _grid_prefetch[user_id] = ((job_id, photo_date, current_page + 1), task)
+        asyncio.get_running_loop().call_later(GRID_PREFETCH_TTL, _expire_grid_prefetch, user_id, task)
+    for idx, (photo_path, abs_path, result) in enumerate(zip(current_photos, abs_paths, loaded), start=1):
+        if isinstance(result, FileNotFoundError):
+            continue
+        if isinstance(result, Exception):
+            logger.error(f"Error loading photo {photo_path}: {result}")
+            continue
+        media, mtime = result
+        caption = f"📸 {idx + start_idx}/{len(photo_paths)}" if idx == 1 else ""
+        media_group.append(InputMediaPhoto(
+            media=media,
+            caption=caption
+        ))
+        sent.append((abs_path, mtime))
 
     # Create navigation buttons
     buttons = []
@@ -1197,24 +1655,15 @@ async def send_photo_grid(update: Update, context: CallbackContext):
     markup = InlineKeyboardMarkup(buttons)
     
     # Format date string for display
-    date_str = "today" if photo_date == datetime.now().date().isoformat() else photo_date
+    date_str = "today" if photo_date == today_iso() else photo_date
 
     try:
         if media_group:
-            if len(media_group) == 1:
-                # Send single photo if only one in this group
-                await update.effective_message.reply_photo(
-                    photo=media_group[0].media,
-                    caption=f"📸 Photos from {date_str} (1/{len(photo_paths)})",
-                    reply_markup=markup
-                )
-            else:
-                # Send media group for multiple photos
-                await update.effective_message.reply_media_group(media_group)
-                await update.effective_message.reply_text(
-                    f"📸 Photos from {date_str} ({start_idx+1}-{end_idx} of {len(photo_paths)})",
-                    reply_markup=markup
-                )
+            await _send_media_pages(
+                update.effective_message, media_group, sent,
+                f"📸 Photos from {date_str} ({start_idx+1}-{end_idx} of {len(photo_paths)})", markup,
+                single_caption=f"📸 Photos from {date_str} (1/{len(photo_paths)})"
+            )
             await update.effective_message.delete()
         else:
             await safe_edit_text(update, MessageTemplates.format_error_message("Photo Error", "Could not display photos."))
@@ -1225,26 +1674,26 @@ async def send_photo_grid(update: Update, context: CallbackContext):
 async def handle_photo_grid_navigation(update: Update, context: CallbackContext):
     """Handle navigation between photo grid pages"""
     data = update.callback_query.data
-    new_page = int(data.split("_")[-1])
+    new_page = parse_trailing_int(data)
     photo_paths = context.user_data.get("job_photos", [])
     
     if not photo_paths or new_page < 0 or new_page >= (len(photo_paths) // 10 + 1):
-        await update.callback_query.answer("Invalid page navigation", show_alert=True)
+        await answer_callback(update, "Invalid page navigation", show_alert=True)
         return
-    
+    await answer_callback(update)
+
     context.user_data["current_page"] = new_page
     await send_photo_grid(update, context)
 
 async def director_view_employee_jobs(update: Update, context: CallbackContext, employee_id: int, employee_name: str):
-    cursor.execute(
-        """
-        SELECT id, site_name, area, status, notes, start_time, finish_time 
+    jobs = await db_fetchall(
+        f"""
+        SELECT {JOB_SECTION_COLUMNS}
         FROM grounds_data 
         WHERE assigned_to = ? AND status != 'completed'
         ORDER BY id
         """, (employee_id,)
     )
-    jobs = cursor.fetchall()
     if not jobs:
         await safe_edit_text(update, MessageTemplates.format_success_message("No Jobs", f"No jobs assigned to {employee_name} today."))
         return
@@ -1252,7 +1701,6 @@ async def director_view_employee_jobs(update: Update, context: CallbackContext,
     sections.extend(await format_job_section("Assigned", jobs))
     buttons = await create_job_buttons(jobs)
     buttons.append([InlineKeyboardButton(f"{ButtonLayouts.BACK_PREFIX} Back", callback_data="director_dashboard")])
-    await safe_edit_text(update, "\n  Back", callback_data="director_dashboard")])
     await safe_edit_text(update, "\n\n".join(sections), reply_markup=InlineKeyboardMarkup(buttons))
 
 async def director_view_andys_jobs(update: Update, context: CallbackContext):
@@ -1260,15 +1708,7 @@ async def director_view_andys_jobs(update: Update, context: CallbackContext):
 
 async def director_view_alexs_jobs(update: Update, context: CallbackContext):
     # Get Alex's ID dynamically
-    alex_id = None
-    for emp_id, name in employee_users.items():
-        if name.lower() == "alex":
-            alex_id = emp_id
-            break
-
-    if not alex_id:
-        alex_id = -7747082939  # Fallback to the ID you provided
-        
+    alex_id = _employees_by_name.get("alex", -7747082939)  # Fallback to the ID you provided
     await director_view_employee_jobs(update, context, alex_id, "Alex")
 
 #####################################
@@ -1276,15 +1716,11 @@ async def director_view_alexs_jobs(update: Update, context: CallbackContext):
 #####################################
 
 async def refresh_weather(update: Update, context: CallbackContext):
-    job_id = int(update.callback_query.data.split("_")[-1])
-    cursor.execute(
-        "SELECT site_name, area, address FROM grounds_data WHERE id = ?", 
-        (job_id,)
-    )
-    job_data = cursor.fetchone()
+    job_id = parse_trailing_int(update.callback_query.data)
+    job_data = await get_job(job_id, SQL_JOB_LOCATION)
 
     if not job_data:
-        await update.callback_query.answer("Job not found", show_alert=True)
+        await answer_callback(update, "Job not found", show_alert=True)
         return
 
     site_name, area, address = job_data
@@ -1292,13 +1728,10 @@ async def refresh_weather(update: Update, context: CallbackContext):
     # Use address if available, otherwise use site name + UK
     location = address if address else f"{site_name},UK"
 
-    # Clear cache to force refresh
-    from weather_integration import weather_cache
-    cache_key = f"{location}_1"
-    if cache_key in weather_cache:
-        del weather_cache[cache_key]
+    await answer_callback(update, "Refreshing weather data...", show_alert=False)
 
-    await update.callback_query.answer("Refreshing weather data...", show_alert=False)
+    # Fetch past the TTL; the cached forecast is kept if the provider fails
+    await get_weather_forecast(location, force_refresh=True)
 
     # Redirect back to job menu to show updated weather
     if update.effective_user.id in director_users:
@@ -1312,11 +1745,7 @@ async def refresh_weather(update: Update, context: CallbackContext):
 
 async def dev_dashboard(update: Update, context: CallbackContext):
     header = MessageTemplates.format_dashboard_header("Dev", "Developer")
-    dev_kb = InlineKeyboardMarkup([
-        [InlineKeyboardButton("Director Dashboard", callback_data="dev_director_dashboard")],
-        [InlineKeyboardButton("Employee Dashboard", callback_data="dev_employee_dashboard")]
-    ])
-    await safe_edit_text(update, header, reply_markup=dev_kb)
+    await safe_edit_text(update, header, reply_markup=DEV_DASHBOARD_KB)
 
 async def dev_director_dashboard(update: Update, context: CallbackContext):
     await director_dashboard(update, context)
@@ -1328,117 +1757,67 @@ async def dev_employee_dashboard(update: Update, context: CallbackContext):
 # CALLBACK HANDLER
 #####################################
 
+async def view_completed_jobs_callback(update: Update, context: CallbackContext, emp_id: int):
+    await director_view_completed_jobs(update, context, emp_id, employee_users.get(emp_id, "Employee"))
+
+async def director_assign_jobs_page(update: Update, context: CallbackContext, after_id: int):
+    cursor_stack = context.user_data.setdefault("page_cursor_stack", [0])
+    # Going back pops to a cursor already on the stack; going forward pushes a new one
+    if after_id in cursor_stack:
+        del cursor_stack[cursor_stack.index(after_id) + 1:]
+    else:
+        cursor_stack.append(after_id)
+    text, markup = await build_director_assign_jobs_page(after_id, context)
+    await safe_edit_text(update, text, reply_markup=markup)
+
+async def noop_callback(update: Update, context: CallbackContext):
+    pass
+
+def find_callback_handler(data: str):
+    """(handler, id_parser) for the exact route, else for the longest matching prefix"""
+    handler = _CALLBACK_HANDLERS.get(data)
+    if handler is not None:
+        return handler, None
+    match = _CALLBACK_PREFIX_RE.match(data)
+    return _CALLBACK_PREFIXES[match.group()] if match else None
+
+# Last callback per user, {user_id: (data, monotonic_ts)}; the same button again within
+# DOUBLE_TAP_SECONDS is treated as a double tap and dropped
+DOUBLE_TAP_SECONDS = 0.3
+_last_callback = {}
+
 async def callback_handler(update: Update, context: CallbackContext):
-    data = update.callback_query.data
-    await update.callback_query.answer()
+    query = update.callback_query
+    data = query.data
+    user_id = update.effective_user.id
+    now = time_module.monotonic()
+    last = _last_callback.get(user_id)
+    _last_callback[user_id] = (data, now)
+    if last and last[0] == data and now - last[1] < DOUBLE_TAP_SECONDS:
+        answer_callback_early(update)
+        _answered_queries.discard(query.id)
+        return
+    entry = find_callback_handler(data)
+    if entry is None or entry[0] not in _SELF_ANSWERING_HANDLERS:
+        answer_callback_early(update)
     try:
-        job_handler = JobHandler()
-        handlers = {
-            "start": start,
-            "dev_dashboard": dev_dashboard,
-            "dev_employee_dashboard": dev_employee_dashboard,
-            "dev_director_dashboard": dev_director_dashboard,
-            "view_andys_jobs": director_view_andys_jobs,
-            "view_alexs_jobs": director_view_alexs_jobs,
-           #"view_tans_jobs": director_view_tans_jobs,
-            "calendar_view": director_calendar_view,
-            "director_dashboard": director_dashboard,
-            "emp_view_jobs": emp_view_jobs,
-            "emp_employee_dashboard": emp_employee_dashboard,
-            "add_notes": director_add_notes,
-            "dir_assign_jobs": director_assign_jobs,
-            "assign_selected_jobs": director_assign_jobs
-        }
-        if data in handlers:
-            await handlers[data](update, context)
-            return
-            
-        # Add refresh_weather handler
-        if data.startswith("refresh_weather_"):
-            await refresh_weather(update, context)
-            return
-            
-        if data.startswith("dir_assign_jobs_list"):
-            await director_assign_jobs_list(update, context)
-        elif data.startswith("add_note_"):
-            await job_handler.prepare_add_note(update, context)
-        elif data.startswith("view_notes_"):
-            job_id = int(data.split('_')[-1])
-            await job_handler.view_job_with_notes(update, context, job_id)
-        elif data.startswith("view_photos_grid_"):
-            await view_job_photos_grid(update, context)
-        elif data.startswith("photo_grid_"):
-            await handle_photo_grid_navigation(update, context)
-        elif data.startswith("finish_upload_"):
-            await finish_photo_upload(update, context)
-        elif data.startswith("view_photos_grid_"):
-            await view_job_photos_grid(update, context)
-        elif data.startswith("add_note_"):
-            job_id = int(data.split("_")[-1])
-            await job_handler.add_note(update, context)
-        elif data.startswith("view_notes_"):
-            job_id = int(data.split('_')[-1])
-            await job_handler.view_job_with_notes(update, context, job_id)
-        elif data.startswith("add_note_"):
-            await job_handler.prepare_add_note(update, context)
-        elif data.startswith("add_photo_note_"):
-            await job_handler.prepare_add_photo_note(update, context)
-        elif data.startswith("add_note_"):
-            await job_handler.add_note_to_job(update, context)
-        elif data.startswith("start_job_with_notes_"):
-            await job_handler.start_job_with_notes(update, context)
-        elif data.startswith("add_work_note_"):
-            await job_handler.add_work_note(update, context)
-        elif data.startswith("job_working_"):
-            await job_handler.job_working_view(update, context)
-        elif data.startswith("select_day_"):
-            await director_select_day_for_assignment(update, context)
-        elif data.startswith("assign_day_"):
-            await director_assign_day_selected(update, context)
-        elif data.startswith("toggle_job_"):
-            await handle_toggle_job(update, context)
-        elif data.startswith("assign_to_"):
-            await assign_jobs_to_employee(update, context)
-        elif data.startswith("view_completed_jobs_"):
-            emp_id = int(data.split("_")[-1])
-            emp_name = employee_users.get(emp_id, "Employee")
-            await director_view_completed_jobs(update, context, emp_id, emp_name)
-        elif data.startswith("job_menu_"):
-            await emp_job_menu(update, context)
-        elif data.startswith("upload_photo_"):
-            await emp_upload_photo(update, context)
-        elif data.startswith("site_info_"):
-            await emp_site_info(update, context)
-        elif data.startswith("start_job_"):
-            await emp_start_job(update, context)
-        elif data.startswith("finish_job_"):
-            await emp_finish_job(update, context)
-        elif data.startswith("map_link_"):
-            await emp_map_link(update, context)
-        elif data.startswith("send_job_"):
-            await director_send_job(update, context)
-        elif data.startswith("edit_note_"):
-            await director_edit_note(update, context)
-        elif data.startswith("cancel_note_"):
-            await director_cancel_note(update, context)
-        elif data.startswith("view_job_"):
-            await director_send_job(update, context)
-        elif data.startswith("view_photos_"):
-            await view_job_photos(update, context)
-        elif data.startswith("photo_nav_"):
-            await handle_photo_navigation(update, context)
-        elif data.startswith("page_"):
-            page = int(data.split("_")[-1])
-            context.user_data["current_page"] = page
-            text, markup = await build_director_assign_jobs_page(page, context)
-            await safe_edit_text(update, text, reply_markup=markup)
-        elif data == "noop":
-            pass
-        else:
+        if entry is None:
             await safe_edit_text(update, MessageTemplates.format_error_message("Unknown Action", "This action is not supported."))
-    except Exception as e:
-        logger.error(f"Error in callback handler: {e}")
-        await safe_edit_text(update, "⚠️ An error occurred. Please try again.")
+            return
+        handler, parser = entry
+        try:
+            if parser is None:
+                await handler(update, context)
+            else:
+                await handler(update, context, parser(data))
+        except Exception:
+            logger.exception("Error in callback handler for %s", data)
+            await safe_edit_text(update, "⚠️ An error occurred. Please try again.")
+    finally:
+        if query.id not in _answered_queries:
+            # A self-answering handler bailed out before answering; clear the spinner anyway
+            answer_callback_early(update)
+        _answered_queries.discard(query.id)
 
 #####################################
 # DAILY RESET FUNCTION
@@ -1465,76 +1844,155 @@ async def start(update: Update, context: CallbackContext):
     else:
         await update.message.reply_text(MessageTemplates.format_error_message("Access Denied", "You do not have a registered role."))
 
-async def help_command(update: Update, context: CallbackContext):
-    # Get user role for role-specific help
-    user_id = update.effective_user.id
-    role = get_user_role(user_id)
-
-    # Base help text
-    base_text = "🤖 *Bot Help*\n\n*/start* - Launch the bot and navigate to your dashboard.\n*/help* - Show this help message.\n\n"
+_HELP_BASE = "🤖 *Bot Help*\n\n*/start* - Launch the bot and navigate to your dashboard.\n*/help* - Show this help message.\n\n"
+
+# Full help text per role, built once; unknown roles get the None entry
+_HELP_BY_ROLE = {
+    "Dev": _HELP_BASE + (
+        "*Developer Commands*\n"
+        "- Access both Director and Employee dashboards for testing\n"
+        "- Test all functionality before deployment\n"
+    ),
+    "Director": _HELP_BASE + (
+        "*Director Commands*\n"
+        "- *Assign Jobs*: Select unassigned sites and assign them to employees\n"
+        "- *View Completed Jobs*: See jobs completed by each employee\n"
+        "- View job details including photos, notes, and weather forecasts\n"
+    ),
+    "Employee": _HELP_BASE + (
+        "*Employee Commands*\n"
+        "- View your assigned jobs\n"
+        "- Start and finish jobs\n"
+        "- Add notes to jobs\n"
+        "- Upload photos of completed work\n"
+        "- Check weather forecasts for outdoor jobs\n"
+    ),
+    None: _HELP_BASE + "You don't have a registered role. Please contact your administrator."
+}
 
-    # Role-specific help
-    role_text = ""
-    if role == "Dev":
-        role_text = (
-            "*Developer Commands*\n"
-            "- Access both Director and Employee dashboards for testing\n"
-            "- Test all functionality before deployment\n"
-        )
-    elif role == "Director":
-        role_text = (
-            "*Director Commands*\n"
-            "- *Assign Jobs*: Select unassigned sites and assign them to employees\n"
-            "- *View Completed Jobs*: See jobs completed by each employee\n"
-            "- View job details including photos, notes, and weather forecasts\n"
-        )
-    elif role == "Employee":
-        role_text = (
-            "*Employee Commands*\n"
-            "- View your assigned jobs\n"
-            "- Start and finish jobs\n"
-            "- Add notes to jobs\n"
-            "- Upload photos of completed work\n"
-            "- Check weather forecasts for outdoor jobs\n"
-        )
-    else:
-        role_text = "You don't have a registered role. Please contact your administrator."
-
-    # Combine texts
-    help_text = base_text + role_text
-
-    if update.callback_query:
-        await update.callback_query.message.reply_text(help_text, parse_mode='Markdown')
-    else:
-        await update.message.reply_text(help_text, parse_mode='Markdown')
+async def help_command(update: Update, context: CallbackContext):
+    help_text = _HELP_BY_ROLE.get(get_user_role(update.effective_user.id), _HELP_BY_ROLE[None])
+    message = update.callback_query.message if update.callback_query else update.message
+    await message.reply_text(help_text, parse_mode='Markdown')
 
 #####################################
 # MAIN FUNCTION & SCHEDULER SETUP
 #####################################
 
-def start_profit_thread():
-    def accumulate_profit():
-        while True:
-            time_module.sleep(3600)  # Fixed: Use time_module instead of time
-            for uid, data in user_data.items():
-                data['points'] += data['profit_per_hour']
-    profit_thread = threading.Thread(target=accumulate_profit, daemon=True)
-    profit_thread.start()
+def _route_table(routes):
+    """Dict from (callback_data, handler) pairs; a key registered twice fails at import instead of shadowing"""
+    table = dict(routes)
+    if len(table) != len(routes):
+        keys = [key for key, _ in routes]
+        duplicates = sorted({key for key in keys if keys.count(key) > 1})
+        raise ValueError(f"Duplicate callback routes: {', '.join(duplicates)}")
+    return table
+
+# Exact-match callback_data routes; prefixed ones are handled in callback_handler
+_CALLBACK_HANDLERS = _route_table([
+    ("start", start),
+    ("dev_dashboard", dev_dashboard),
+    ("dev_employee_dashboard", dev_employee_dashboard),
+    ("dev_director_dashboard", dev_director_dashboard),
+    ("view_andys_jobs", director_view_andys_jobs),
+    ("view_alexs_jobs", director_view_alexs_jobs),
+   #("view_tans_jobs", director_view_tans_jobs),
+    ("calendar_view", director_calendar_view),
+    ("director_dashboard", director_dashboard),
+    ("emp_view_jobs", emp_view_jobs),
+    ("emp_employee_dashboard", emp_employee_dashboard),
+    ("add_notes", director_add_notes),
+    ("dir_assign_jobs", director_assign_jobs),
+    ("assign_selected_jobs", director_assign_jobs),
+    ("dir_assign_jobs_list", director_assign_jobs_list),
+    ("noop", noop_callback),
+])
+
+# callback_data prefix (ends in "_") -> (handler, id_parser); handlers with a parser get the parsed id
+# as a third argument. find_callback_handler picks the longest matching prefix
+_CALLBACK_PREFIXES = _route_table([
+    ("refresh_weather_", (refresh_weather, None)),
+    ("add_note_", (job_handler.prepare_add_note, None)),
+    ("add_photo_note_", (job_handler.prepare_add_photo_note, None)),
+    ("view_notes_", (job_handler.view_job_with_notes, parse_trailing_int)),
+    ("start_job_with_notes_", (job_handler.start_job_with_notes, None)),
+    ("add_work_note_", (job_handler.add_work_note, None)),
+    ("job_working_", (job_handler.job_working_view, None)),
+    ("view_photos_grid_", (view_job_photos_grid, None)),
+    ("view_photos_", (view_job_photos, None)),
+    ("photo_grid_", (handle_photo_grid_navigation, None)),
+    ("photo_nav_", (handle_photo_navigation, None)),
+    ("finish_upload_", (finish_photo_upload, None)),
+    ("select_day_", (director_select_day_for_assignment, None)),
+    ("assign_day_", (director_assign_day_selected, None)),
+    ("toggle_job_", (handle_toggle_job, None)),
+    ("assign_to_", (assign_jobs_to_employee, None)),
+    ("view_completed_jobs_", (view_completed_jobs_callback, parse_trailing_int)),
+    ("job_menu_", (emp_job_menu, None)),
+    ("upload_photo_", (emp_upload_photo, None)),
+    ("site_info_", (emp_site_info, None)),
+    ("start_job_", (emp_start_job, None)),
+    ("finish_job_", (emp_finish_job, None)),
+    ("map_link_", (emp_map_link, None)),
+    ("send_job_", (director_send_job, None)),
+    ("view_job_", (director_send_job, None)),
+    ("edit_note_", (director_edit_note, None)),
+    ("cancel_note_", (director_cancel_note, None)),
+    ("page_", (director_assign_jobs_page, parse_trailing_int)),
+])
+
+# Handlers that answer their own query with a toast or alert popup, so callback_handler leaves the
+# answer to them (its finally still answers if they return without doing so)
+_SELF_ANSWERING_HANDLERS = {
+    finish_photo_upload,
+    refresh_weather,
+    handle_toggle_job,
+    handle_photo_navigation,
+    handle_photo_grid_navigation,
+}
+
+# One alternation over all prefixes, longest first so view_photos_grid_ wins over view_photos_
+_CALLBACK_PREFIX_RE = re.compile(
+    "|".join(re.escape(prefix) for prefix in sorted(_CALLBACK_PREFIXES, key=len, reverse=True))
+)
+
+PROFIT_INTERVAL_SECONDS = 3600
+
+async def accumulate_profit(context: CallbackContext):
+    for data in user_data.values():
+        data['points'] += data['profit_per_hour']
 
 def main() -> None:
     # Check for weather API key
-    if not os.getenv("WEATHER_API_KEY"):
+    if not WEATHER_API_KEY:
         logger.warning("WEATHER_API_KEY environment variable not set. Weather forecasts will be unavailable.")
         logger.info("Get a free API key from https://openweathermap.org/ and set it as WEATHER_API_KEY")
 
-    application = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
-    job_handler = JobHandler()
+    os.makedirs(PHOTO_DIR, exist_ok=True)
+
+    # SIGHUP only clears the get_user_role memo. The role sets are literals in settings.py, read once at
+    # import, so editing them still needs a restart; this is a hook for code that mutates them at runtime
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: invalidate_role_cache())
+
+    application = (
+        ApplicationBuilder()
+        .token(TELEGRAM_BOT_TOKEN)
+        # 25 calls/s overall and 1 call/s per group chat (negative chat ids only); on RetryAfter it
+        # sleeps and retries. Private chats are paced separately by pace_chat
+        .rate_limiter(AIORateLimiter(overall_max_rate=25, group_max_rate=1, group_time_period=1, max_retries=3))
+        .post_init(init_db)
+        .post_shutdown(close_db)
+        .build()
+    )
     # Add handlers
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(MessageHandler(filters.PHOTO & ~filters.COMMAND, handle_photo))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
-    application.add_handler(CallbackQueryHandler(callback_handler))
+    # New messages only; edits and channel posts never reach the photo/text handlers
+    application.add_handler(MessageHandler(filters.PHOTO & ~filters.COMMAND & filters.UpdateType.MESSAGE, handle_photo))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND & filters.UpdateType.MESSAGE, handle_text))
+    # Non-blocking so a slow callback (photo grids, weather) doesn't hold up later updates
+    application.add_handler(CallbackQueryHandler(callback_handler, block=False))
 
     # Schedule daily reset
     try:
@@ -1542,8 +2000,23 @@ def main() -> None:
     except Exception as e:
         logger.error(f"Failed to schedule daily reset: {e}")
 
-    start_profit_thread()
-    application.run_polling()
+    # Dashboard counters are reconciled with the table as a safety net for changes made elsewhere
+    application.job_queue.run_repeating(
+        refresh_status_counts,
+        interval=STATUS_COUNTS_RECONCILE_SECONDS,
+        first=STATUS_COUNTS_RECONCILE_SECONDS,
+        name="status_counts_reconcile"
+    )
+
+    application.job_queue.run_repeating(
+        accumulate_profit,
+        interval=PROFIT_INTERVAL_SECONDS,
+        first=PROFIT_INTERVAL_SECONDS,
+        name="accumulate_profit"
+    )
+
+    # Only the update types handled above are requested from Telegram
+    application.run_polling(allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY])
 
 if __name__ == "__main__":
     main()
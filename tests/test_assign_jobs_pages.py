@@ -0,0 +1,96 @@
+import os
+import sqlite3
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+
+import telegram_bot
+
+
+@pytest.fixture
+def jobs_db(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE grounds_data (id INTEGER PRIMARY KEY, site_name TEXT, area TEXT, status TEXT, assigned_to INTEGER)")
+    conn.executemany(
+        "INSERT INTO grounds_data (id, site_name, area, status) VALUES (?, ?, 'North', 'pending')",
+        [(i, f"Site {i}") for i in range(1, 26)]
+    )
+    queries = []
+
+    async def db_fetchall(sql, params=()):
+        queries.append(params)
+        return conn.execute(sql, params).fetchall()
+
+    monkeypatch.setattr(telegram_bot, "db_fetchall", db_fetchall)
+    monkeypatch.setattr(telegram_bot, "safe_edit_text", AsyncMock())
+    telegram_bot._PAGE_CACHE.clear()
+    yield conn, queries
+    telegram_bot._PAGE_CACHE.clear()
+
+
+def _callbacks(markup):
+    return [button.callback_data for row in markup.inline_keyboard for button in row]
+
+
+def _context():
+    context = MagicMock()
+    context.user_data = {}
+    return context
+
+
+@pytest.mark.asyncio
+async def test_next_and_previous_walk_the_cursor_stack(jobs_db):
+    context = _context()
+    await telegram_bot.director_assign_jobs_list(MagicMock(), context)
+    first = telegram_bot.safe_edit_text.await_args.kwargs["reply_markup"]
+    assert "toggle_job_1" in _callbacks(first) and "page_10" in _callbacks(first)
+    assert not any(c.startswith("page_") and c != "page_10" for c in _callbacks(first))
+
+    await telegram_bot.director_assign_jobs_page(MagicMock(), context, 10)
+    second = _callbacks(telegram_bot.safe_edit_text.await_args.kwargs["reply_markup"])
+    assert context.user_data["page_cursor_stack"] == [0, 10]
+    assert "toggle_job_11" in second and "page_0" in second and "page_20" in second
+
+    await telegram_bot.director_assign_jobs_page(MagicMock(), context, 20)
+    third = _callbacks(telegram_bot.safe_edit_text.await_args.kwargs["reply_markup"])
+    assert "toggle_job_25" in third and "page_10" in third and "page_30" not in third
+
+    await telegram_bot.director_assign_jobs_page(MagicMock(), context, 10)
+    assert context.user_data["page_cursor_stack"] == [0, 10]
+
+
+@pytest.mark.asyncio
+async def test_toggle_flips_one_bit_and_ids_are_recovered(jobs_db):
+    context = _context()
+    context.user_data["page_cursor_stack"] = [0]
+    update = MagicMock()
+    for job_id in (3, 7, 3, 9):
+        update.callback_query.data = f"toggle_job_{job_id}"
+        await telegram_bot.handle_toggle_job(update, context)
+
+    assert context.user_data["selected_jobs"] == (1 << 7) | (1 << 9)
+    assert telegram_bot.selected_job_ids(context.user_data["selected_jobs"]) == [7, 9]
+    assert telegram_bot.selected_job_ids(0) == []
+    assert telegram_bot.selected_job_ids(1 << 500 | 1) == [0, 500]
+
+
+@pytest.mark.asyncio
+async def test_page_cache_hits_until_ttl_or_version_bump(jobs_db, monkeypatch):
+    _, queries = jobs_db
+    context = _context()
+    clock = [1000.0]
+    monkeypatch.setattr(telegram_bot.time_module, "monotonic", lambda: clock[0])
+
+    await telegram_bot.build_director_assign_jobs_page(0, context)
+    await telegram_bot.build_director_assign_jobs_page(0, context)
+    assert len(queries) == 1
+
+    clock[0] += telegram_bot.PAGE_CACHE_TTL + 1
+    await telegram_bot.build_director_assign_jobs_page(0, context)
+    assert len(queries) == 2
+
+    telegram_bot.bump_jobs_version()
+    await telegram_bot.build_director_assign_jobs_page(0, context)
+    assert len(queries) == 3
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+
+import telegram_bot
+
+
+def test_duplicate_route_is_rejected():
+    with pytest.raises(ValueError, match="view_job_"):
+        telegram_bot._route_table([
+            ("view_job_", "first"),
+            ("send_job_", "other"),
+            ("view_job_", "second"),
+        ])
+
+
+def test_exact_route_wins_over_prefixes():
+    assert telegram_bot.find_callback_handler("dir_assign_jobs_list") == (telegram_bot.director_assign_jobs_list, None)
+
+
+def test_longest_prefix_is_chosen():
+    assert telegram_bot.find_callback_handler("view_photos_grid_3") == (telegram_bot.view_job_photos_grid, None)
+    assert telegram_bot.find_callback_handler("view_photos_3") == (telegram_bot.view_job_photos, None)
+    assert telegram_bot.find_callback_handler("start_job_with_notes_4")[0] == telegram_bot.job_handler.start_job_with_notes
+    assert telegram_bot.find_callback_handler("start_job_4")[0] is telegram_bot.emp_start_job
+
+
+def test_every_prefix_routes_to_its_own_entry():
+    for prefix, entry in telegram_bot._CALLBACK_PREFIXES.items():
+        assert telegram_bot.find_callback_handler(f"{prefix}12") == entry
+
+
+def test_unknown_data_has_no_handler():
+    assert telegram_bot.find_callback_handler("no_such_button_1") is None
+
+
+def test_parser_takes_the_trailing_id():
+    handler, parser = telegram_bot.find_callback_handler("view_completed_jobs_17")
+    assert handler is telegram_bot.view_completed_jobs_callback
+    assert parser("view_completed_jobs_17") == 17
+
+
+@pytest.mark.asyncio
+async def test_double_tap_is_dropped(monkeypatch):
+    calls = []
+
+    async def handler(update, context):
+        calls.append(update.callback_query.data)
+
+    monkeypatch.setitem(telegram_bot._CALLBACK_HANDLERS, "noop", handler)
+    monkeypatch.setattr(telegram_bot, "_last_callback", {})
+    now = [100.0]
+    monkeypatch.setattr(telegram_bot.time_module, "monotonic", lambda: now[0])
+
+    def update(query_id):
+        update = MagicMock()
+        update.effective_user.id = 1
+        update.callback_query.id = query_id
+        update.callback_query.data = "noop"
+        update.callback_query.answer = AsyncMock()
+        return update
+
+    first, double, later = update("q1"), update("q2"), update("q3")
+    for ts, u in ((100.0, first), (100.1, double), (100.5, later)):
+        now[0] = ts
+        await telegram_bot.callback_handler(u, MagicMock())
+    await asyncio.gather(*telegram_bot._answer_tasks)
+
+    assert calls == ["noop", "noop"]
+    # The dropped tap is still answered so its spinner clears
+    double.callback_query.answer.assert_awaited_once()
@@ -0,0 +1,59 @@
+import os
+import sqlite3
+
+import pytest
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+
+import telegram_bot
+
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = telegram_bot.DBWriter(str(tmp_path / "writer.db"))
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+async def _rows(writer):
+    with sqlite3.connect(writer._path) as conn:
+        return conn.execute("SELECT id, name FROM t ORDER BY id").fetchall()
+
+
+@pytest.mark.asyncio
+async def test_failing_statement_does_not_roll_back_its_batch(writer):
+    await writer.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    await writer.execute("INSERT INTO t (name) VALUES (?)", ("a",))
+    with pytest.raises(sqlite3.IntegrityError):
+        await writer.execute("INSERT INTO t (name) VALUES (?)", ("a",))
+    assert await writer.execute("INSERT INTO t (name) VALUES (?)", ("b",)) == 1
+    assert await _rows(writer) == [(1, "a"), (2, "b")]
+
+
+@pytest.mark.asyncio
+async def test_non_sqlite_error_is_returned_and_writer_keeps_running(writer):
+    await writer.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    with pytest.raises(OverflowError):
+        await writer.execute("INSERT INTO t (id, name) VALUES (?, ?)", (1 << 70, "big"))
+    assert await writer.execute("INSERT INTO t (name) VALUES (?)", ("ok",)) == 1
+    assert await _rows(writer) == [(1, "ok")]
+
+
+@pytest.mark.asyncio
+async def test_execute_atomic_applies_all_statements_or_none(writer):
+    await writer.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    for name in ("a", "b", "c"):
+        await writer.execute("INSERT INTO t (name) VALUES (?)", (name,))
+
+    assert await writer.execute_atomic([
+        ("UPDATE t SET name = 'x' WHERE id IN (1, 2)", ()),
+        ("UPDATE t SET name = 'x' WHERE id = 3", ()),
+    ]) == 3
+
+    with pytest.raises(sqlite3.OperationalError):
+        await writer.execute_atomic([
+            ("UPDATE t SET name = 'y' WHERE id = 1", ()),
+            ("UPDATE missing SET name = 'y'", ()),
+        ])
+    assert await _rows(writer) == [(1, "x"), (2, "x"), (3, "x")]
@@ -0,0 +1,28 @@
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+
+import telegram_bot
+
+
+@pytest.mark.asyncio
+async def test_director_view_employee_jobs_edits_message_once(monkeypatch):
+    jobs = [
+        (1, "Site A", "North", "pending", None, None),
+        (2, "Site B", "South", "in_progress", "Gate locked", None),
+    ]
+    monkeypatch.setattr(telegram_bot, "db_fetchall", AsyncMock(return_value=jobs))
+    safe_edit_text = AsyncMock()
+    monkeypatch.setattr(telegram_bot, "safe_edit_text", safe_edit_text)
+    update = MagicMock()
+
+    await telegram_bot.director_view_employee_jobs(update, MagicMock(), 7500942259, "Andy")
+
+    safe_edit_text.assert_awaited_once()
+    args, kwargs = safe_edit_text.await_args
+    assert args[0] is update
+    assert "SITE A" in args[1] and "SITE B" in args[1]
+    assert kwargs["reply_markup"] is not None
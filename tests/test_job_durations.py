@@ -0,0 +1,41 @@
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+
+import telegram_bot
+
+
+def _random_pairs(rng, count):
+    base = datetime(2024, 1, 1)
+    for _ in range(count):
+        start = base + timedelta(seconds=rng.randrange(365 * 86400), microseconds=rng.randrange(1_000_000))
+        finish = start + timedelta(seconds=rng.randrange(12 * 3600), microseconds=rng.randrange(1_000_000))
+        if rng.random() < 0.2:
+            # datetime.isoformat() omits the fraction when it is zero
+            start, finish = start.replace(microsecond=0), finish.replace(microsecond=0)
+        yield start.isoformat(), finish.isoformat()
+
+
+def test_sql_and_python_durations_agree():
+    pairs = list(_random_pairs(random.Random(13), 50_000))
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE grounds_data (id INTEGER PRIMARY KEY, site_name TEXT, area TEXT, status TEXT, "
+                 "notes TEXT, start_time TEXT, finish_time TEXT)")
+    conn.executemany("INSERT INTO grounds_data (start_time, finish_time) VALUES (?, ?)", pairs)
+    rows = conn.execute(f"SELECT {telegram_bot.JOB_SECTION_COLUMNS} FROM grounds_data ORDER BY id").fetchall()
+
+    for (start, finish), row in zip(pairs, rows):
+        assert telegram_bot.format_duration(row[-1]) == telegram_bot.parse_times(start, finish)[3], (start, finish)
+
+
+def test_unfinished_job_has_no_duration():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE grounds_data (id INTEGER PRIMARY KEY, site_name TEXT, area TEXT, status TEXT, "
+                 "notes TEXT, start_time TEXT, finish_time TEXT)")
+    conn.execute("INSERT INTO grounds_data (start_time) VALUES ('2024-05-01T08:00:00.250000')")
+
+    assert conn.execute(f"SELECT {telegram_bot.JOB_SECTION_COLUMNS} FROM grounds_data").fetchone()[-1] is None
+    assert telegram_bot.parse_times("2024-05-01T08:00:00.250000", None)[3] is None
@@ -0,0 +1,67 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+
+import telegram_bot
+
+
+def _update(message_id):
+    update = MagicMock()
+    update.effective_message.chat_id = 1
+    update.effective_message.message_id = message_id
+    return update
+
+
+@pytest.mark.asyncio
+async def test_idle_message_is_edited_immediately():
+    update = _update(10)
+    update.effective_message.edit_text = AsyncMock()
+
+    await telegram_bot.safe_edit_text(update, "one")
+
+    update.effective_message.edit_text.assert_awaited_once_with("one", reply_markup=None)
+
+
+@pytest.mark.asyncio
+async def test_edits_during_a_send_collapse_into_one_trailing_edit():
+    update = _update(11)
+    release = asyncio.Event()
+    sent = []
+
+    async def edit_text(text, reply_markup=None):
+        sent.append(text)
+        await release.wait()
+
+    update.effective_message.edit_text = edit_text
+    first = asyncio.create_task(telegram_bot.safe_edit_text(update, "first"))
+    await asyncio.sleep(0)
+    await telegram_bot.safe_edit_text(update, "second")
+    await telegram_bot.safe_edit_text(update, "third")
+    release.set()
+    await first
+
+    assert sent == ["first", "third"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_edit_releases_the_message():
+    update = _update(12)
+    never = asyncio.Event()
+
+    async def edit_text(text, reply_markup=None):
+        await never.wait()
+
+    update.effective_message.edit_text = edit_text
+    task = asyncio.create_task(telegram_bot.safe_edit_text(update, "stuck"))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    update.effective_message.edit_text = AsyncMock()
+    await telegram_bot.safe_edit_text(update, "next")
+    update.effective_message.edit_text.assert_awaited_once_with("next", reply_markup=None)
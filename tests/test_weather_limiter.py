@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+import weather_integration
+
+
+class FakeResponse:
+    def __init__(self, status, body_error=None):
+        self.status = status
+        self.body_error = body_error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def json(self):
+        if self.body_error:
+            raise self.body_error
+        return {"list": []}
+
+    async def text(self):
+        return ""
+
+
+class FakeSession:
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def get(self, url):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(weather_integration, "WEATHER_API_KEY", "test-key")
+    monkeypatch.setattr(weather_integration, "weather_cache", {})
+    monkeypatch.setattr(weather_integration, "concurrency_limit", 2.0)
+    monkeypatch.setattr(weather_integration, "_in_flight", 0)
+    monkeypatch.setattr(weather_integration, "_slot_free", None)
+
+    async def fetch(outcome):
+        monkeypatch.setattr(weather_integration.aiohttp, "ClientSession", lambda: FakeSession(outcome))
+        await weather_integration.get_weather_forecast("Bristol,UK", force_refresh=True)
+        return weather_integration.concurrency_limit
+
+    return fetch
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("outcome, expected", [
+    (FakeResponse(200), 2.5),
+    (FakeResponse(404), 2.0),
+    (FakeResponse(429), 1.0),
+    (FakeResponse(503), 1.0),
+    (asyncio.TimeoutError(), 1.0),
+    (FakeResponse(200, body_error=asyncio.TimeoutError()), 1.0),
+])
+async def test_limit_follows_the_response(limiter, outcome, expected):
+    assert await limiter(outcome) == expected
+    assert weather_integration._in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_stays_within_bounds(limiter):
+    for _ in range(10):
+        await limiter(FakeResponse(200))
+    assert weather_integration.concurrency_limit == weather_integration.MAX_CONCURRENCY
+    for _ in range(10):
+        await limiter(FakeResponse(429))
+    assert weather_integration.concurrency_limit == 1.0
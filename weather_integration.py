@@ -1,4 +1,5 @@
 import os
+import asyncio
 import aiohttp
 import logging
 from datetime import datetime, timedelta
@@ -10,15 +11,51 @@ WEATHER_API_KEY = os.getenv("WEATHER_API_KEY", "")
 
 # Cache weather data to avoid excessive API calls
 weather_cache = {}
-CACHE_EXPIRY = 3600  # Cache weather data for 1 hour
+CACHE_EXPIRY = 900  # Cache weather data for 15 minutes
 
-async def get_weather_forecast(location, days=1):
+# Concurrent API requests, adjusted AIMD-style: +0.5 per 2xx, halved on 429/5xx, timeouts and
+# connection errors; other 4xx (bad location etc.) leave it unchanged
+MAX_CONCURRENCY = 4.0
+concurrency_limit = MAX_CONCURRENCY
+_in_flight = 0
+_slot_free = None
+
+async def _acquire_slot():
+    global _in_flight, _slot_free
+    if _slot_free is None:
+        _slot_free = asyncio.Condition()
+    async with _slot_free:
+        await _slot_free.wait_for(lambda: _in_flight < int(concurrency_limit))
+        _in_flight += 1
+
+async def _release_slot(succeeded, throttled):
+    global _in_flight, concurrency_limit
+    async with _slot_free:
+        _in_flight -= 1
+        if throttled:
+            concurrency_limit = max(1.0, concurrency_limit * 0.5)
+        elif succeeded:
+            concurrency_limit = min(MAX_CONCURRENCY, concurrency_limit + 0.5)
+        _slot_free.notify_all()
+
+def _cache_key(location, days):
+    """Cache key with coordinates rounded to ~1 km so nearby sites share a forecast"""
+    parts = location.split(",")
+    try:
+        if len(parts) == 2:
+            return f"{float(parts[0]):.2f},{float(parts[1]):.2f}_{days}"
+    except ValueError:
+        pass
+    return f"{location}_{days}"
+
+async def get_weather_forecast(location, days=1, force_refresh=False):
     """
     Get weather forecast for a location
     
     Args:
         location (str): Location name or coordinates (e.g., "Bristol,UK" or "51.4545,-2.5879")
         days (int): Number of days to forecast (1-5)
+        force_refresh (bool): Skip the cached copy; it is only replaced if the new fetch succeeds
     
     Returns:
         dict: Weather forecast data or None if error
@@ -28,9 +65,9 @@ async def get_weather_forecast(location, days=1):
         return None
     
     # Check cache first
-    cache_key = f"{location}_{days}"
+    cache_key = _cache_key(location, days)
     current_time = datetime.now()
-    if cache_key in weather_cache:
+    if cache_key in weather_cache and not force_refresh:
         cached_data, timestamp = weather_cache[cache_key]
         if current_time - timestamp < timedelta(seconds=CACHE_EXPIRY):
             return cached_data
@@ -43,10 +80,14 @@ async def get_weather_forecast(location, days=1):
         lat, lon = location.split(",")
         url = f"https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={WEATHER_API_KEY}&units=metric&cnt={days*8}"
     
+    await _acquire_slot()
+    succeeded = False
+    throttled = True  # Until a response arrives; timeouts and connection errors back off
     try:
         async with aiohttp.ClientSession() as session:
             async with session.get(url) as response:
-                if response.status == 200:
+                throttled = response.status == 429 or response.status >= 500
+                if 200 <= response.status < 300:
                     data = await response.json()
                     
                     # Process the data to make it more usable
@@ -54,14 +95,19 @@ async def get_weather_forecast(location, days=1):
                     
                     # Cache the result
                     weather_cache[cache_key] = (processed_data, current_time)
+                    succeeded = True
                     
                     return processed_data
                 else:
                     logger.error(f"Weather API error: {response.status} - {await response.text()}")
                     return None
     except Exception as e:
+        # Includes a body read that times out after the status arrived
+        throttled = throttled or isinstance(e, (asyncio.TimeoutError, aiohttp.ClientError))
         logger.error(f"Error fetching weather data: {e}")
         return None
+    finally:
+        await _release_slot(succeeded, throttled)
 
 def process_weather_data(data):
     """Process raw weather API data into a more usable format"""